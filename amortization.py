@@ -0,0 +1,62 @@
+import numpy as np
+
+
+def monthly_payment(principal, annual_rates, months):
+    """Level monthly payment that repays principal over months, for arrays of rates (in %) and terms"""
+    rate = np.asarray(annual_rates, dtype=float) / 1200
+    months = np.asarray(months, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = principal * rate / (1 - (1 + rate) ** -months)
+    return np.where(rate > 0, payment, principal / months)
+
+
+def amortize_grid(principal, annual_rates, terms_years, extra_payments):
+    """Amortize every (rate, term, extra payment) combination in one vectorized pass
+
+    annual_rates are in percent. Results are arrays shaped
+    (len(annual_rates), len(terms_years), len(extra_payments)):
+    the scheduled monthly payment, the month the loan is paid off and the
+    total interest paid, all in closed form rather than month-by-month loops.
+    """
+    rate = np.asarray(annual_rates, dtype=float)[:, None, None] / 1200
+    months = np.asarray(terms_years, dtype=float)[None, :, None] * 12
+    extra = np.asarray(extra_payments, dtype=float)[None, None, :]
+
+    payment = monthly_payment(principal, rate * 1200, months)
+    paid = payment + extra
+    growth = np.log1p(rate)
+
+    # Solve balance(n) = 0 for n, where balance(n) = B(1+r)^n - paid((1+r)^n - 1)/r
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exact_months = np.where(rate > 0, -np.log1p(-rate * principal / paid) / growth, principal / paid)
+    payoff_month = np.minimum(np.ceil(exact_months - 1e-9), months)
+
+    # Everything before the payoff month is a full payment; the last one clears what's left
+    before_last = payoff_month - 1
+    compounded = np.exp(growth * before_last)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(rate > 0, (compounded - 1) / rate, before_last)
+    remaining = principal * compounded - paid * annuity
+    total_paid = paid * before_last + remaining * (1 + rate)
+
+    shape = np.broadcast_shapes(rate.shape, months.shape, extra.shape)
+    return {
+        "payment": np.broadcast_to(payment, shape),
+        "payoff_month": np.broadcast_to(payoff_month, shape).astype(int),
+        "total_interest": np.broadcast_to(total_paid - principal, shape)
+    }
+
+
+def balance_schedules(principal, annual_rates, monthly_payments, months):
+    """Remaining balance after each month 0..months for paired arrays of rates (in %) and payments
+
+    Returns a (scenarios, months + 1) array, clipped at zero once a loan is paid off.
+    """
+    rate = np.asarray(annual_rates, dtype=float)[:, None] / 1200
+    paid = np.asarray(monthly_payments, dtype=float)[:, None]
+    elapsed = np.arange(months + 1)[None, :]
+
+    compounded = (1 + rate) ** elapsed
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(rate > 0, (compounded - 1) / rate, elapsed)
+    return np.maximum(principal * compounded - paid * annuity, 0.0)
@@ -1,5 +1,5 @@
 import streamlit as st
-from utils import load_css, display_sidebar
+from utils import load_css, display_sidebar, time_page_run
 
 # Configuration
 st.set_page_config(
@@ -9,6 +9,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Time this run of the page
+time_page_run("home")
+
 # Load custom CSS
 load_css()
 
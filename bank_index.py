@@ -0,0 +1,63 @@
+import json
+import numpy as np
+import pandas as pd
+
+PERKS_COLUMN = "Student Account Perks"
+
+
+class BankRateIndex:
+    """Bank product catalog indexed for filtered, sorted and paginated queries
+
+    Every non-rate column is stored as a categorical. Each rate column keeps
+    precomputed highest-first row orders, one for all products and one for
+    products with student perks, with products lacking that rate left out. A
+    query is then a slice of one of those orders followed by a take() of just
+    the rows on the requested page, so the catalog is never re-sorted or copied.
+    """
+
+    def __init__(self, frame, rate_columns=None):
+        frame = frame.reset_index(drop=True)
+        if rate_columns is None:
+            rate_columns = list(frame.select_dtypes("number").columns)
+        for column in frame.columns:
+            if column not in rate_columns:
+                frame[column] = frame[column].astype("category")
+
+        self.frame = frame
+        self.rate_columns = list(rate_columns)
+
+        has_perks = (frame[PERKS_COLUMN] == "Yes").to_numpy() if PERKS_COLUMN in frame else None
+        self._orders = {}
+        for column in self.rate_columns:
+            rates = frame[column].to_numpy(dtype=float)
+            order = np.argsort(-rates, kind="stable")
+            order = order[~np.isnan(rates[order])]
+            self._orders[column, False] = order
+            if has_perks is not None:
+                self._orders[column, True] = order[has_perks[order]]
+
+    @classmethod
+    def from_file(cls, path, rate_columns=None):
+        """Load a catalog from a column-oriented JSON file or a CSV file"""
+        if path.endswith(".csv"):
+            frame = pd.read_csv(path)
+        else:
+            with open(path, encoding="utf-8") as f:
+                frame = pd.DataFrame(json.load(f))
+        return cls(frame, rate_columns)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def query(self, rate_column, perks_only=False, ascending=False, offset=0, limit=25):
+        """Return (page of products sorted by rate_column, total matching products)"""
+        if perks_only and (rate_column, True) not in self._orders:
+            raise ValueError(f"Catalog has no {PERKS_COLUMN!r} column to filter on")
+        order = self._orders[rate_column, perks_only]
+        if ascending:
+            order = order[::-1]
+        return self.frame.take(order[offset:offset + limit]), order.size
+
+    def top_k(self, rate_column, k, perks_only=False):
+        """Return the k products with the highest rate_column"""
+        return self.query(rate_column, perks_only=perks_only, limit=k)[0]
@@ -0,0 +1,49 @@
+"""Shared helpers for driving page scripts headlessly with Streamlit's AppTest"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from perf import percentile
+
+MAIN_SCRIPT = os.path.join(ROOT, "app.py")
+
+
+def open_page(page, timeout=120):
+    """Create an AppTest session on a page script without running it yet
+
+    Sessions always start from app.py so st.page_link and st.switch_page can
+    resolve every page, exactly as they do under `streamlit run app.py`.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(MAIN_SCRIPT, default_timeout=timeout)
+    if page != "app.py":
+        app.switch_page(page)
+    return app
+
+
+def check_run(app):
+    """Raise if the last run of a session hit an exception"""
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return app
+
+
+def find_button(app, label):
+    """Find a rendered button (including form submit buttons) by its label"""
+    for button in app.button:
+        if button.label == label:
+            return button
+    raise LookupError(f"No button labelled {label!r}")
+
+
+def summarize(samples):
+    """Return median and p95 of a list of durations in seconds, in milliseconds"""
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(percentile(ordered, 0.5) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2)
+    }
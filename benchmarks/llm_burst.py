@@ -0,0 +1,129 @@
+"""Synthetic classroom burst against the LLM request path
+
+A class of --students opens generated terms at the same instant: --same-share
+of them open the term the lecturer just mentioned and the rest pick from a
+spread of others. The burst runs against a local mock model server (see
+mock_llm_server.py) three ways:
+
+    direct     every student streams straight from the client (no gateway)
+    gateway    streams go through LLMGateway: coalesced, queued and limited
+    batched    the gateway with micro-batching, students asking for whole texts
+
+Each run starts from an empty response cache. For each it reports upstream
+calls, upstream calls per minute over the burst, latency percentiles to the
+full text and how many students were turned away or timed out.
+
+Usage:
+    python benchmarks/llm_burst.py --students 200 --same-share 0.8
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+
+from mock_llm_server import start_mock_server
+
+# Imported only so it puts the repository root on sys.path; the app modules
+# below are not importable from benchmarks/ without it
+import harness  # noqa: F401
+from config import LLM_CONFIG
+from llm import PROMPT_VERSION, LLMClient, build_messages
+from llm_cache import ResponseCache, make_cache_key
+from llm_gateway import LLMGateway
+from perf import percentile
+
+OTHER_TERMS = [
+    "Roth IRA", "Index Funds", "Overdraft Fees", "Expense Tracking", "W-2 Forms", "Education Tax Credits",
+    "High-Yield Savings", "50/30/20 Rule", "Certificates of Deposit", "Credit Utilization", "Sinking Funds",
+    "Work-Study", "Subsidized Loans", "Income-Driven Repayment", "Dollar-Cost Averaging", "Renters Insurance"
+]
+
+
+def burst_terms(students, same_share, seed):
+    """The term each student opens"""
+    rng = random.Random(seed)
+    return ["Capital Gains" if rng.random() < same_share else rng.choice(OTHER_TERMS) for _ in range(students)]
+
+
+def run_burst(terms, request):
+    """Start every student at once; return (latencies of successful students, failure count)"""
+    start = threading.Barrier(len(terms))
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+
+    def student(term):
+        start.wait()
+        started = time.perf_counter()
+        try:
+            request(term)
+        except Exception as e:
+            with lock:
+                failures.append(type(e).__name__)
+            return
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=student, args=(term,)) for term in terms]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--same-share", type=float, default=0.8, help="share of students opening the same term")
+    parser.add_argument("--ttft", type=float, default=0.4, help="mock server seconds to first token")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="mock server seconds per token")
+    parser.add_argument("--capacity", type=int, default=8, help="generations the mock server serves at once")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = start_mock_server(ttft=args.ttft, token_delay=args.token_delay, capacity=args.capacity)
+    config = dict(LLM_CONFIG, base_url=server.url, api_key="")
+    terms = burst_terms(args.students, args.same_share, args.seed)
+    print(f"{args.students} students, {len(set(terms))} distinct terms, mock server capacity {args.capacity}\n")
+
+    def cache_key(term):
+        return make_cache_key(term.lower(), config["model"], config["temperature"], PROMPT_VERSION, "content")
+
+    def direct(term):
+        # A client per student, as separate sessions each used to open their own connection
+        "".join(LLMClient(config).stream(build_messages("content", term)))
+
+    def gateway_runner(batching, stream):
+        cache = ResponseCache(tempfile.mkdtemp(prefix="llm-burst-"))
+        gateway = LLMGateway(
+            LLMClient(config), cache,
+            max_concurrent=config["max_parallel_requests"], max_queued=config["max_queued_requests"],
+            queue_timeout=config["queue_timeout"], batching=batching,
+            batch_size=config["batch_size"], batch_wait=config["batch_wait_ms"] / 1000
+        )
+        if stream:
+            return lambda term: "".join(gateway.stream(cache_key(term), build_messages("content", term)))
+        return lambda term: gateway.complete(cache_key(term), build_messages("content", term))
+
+    runs = [
+        ("direct", direct),
+        ("gateway", gateway_runner(batching=False, stream=True)),
+        ("batched", gateway_runner(batching=True, stream=False))
+    ]
+    print(f"{'mode':<9} {'calls':>6} {'prompts':>8} {'calls/min':>10} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'failed':>7}")
+    for mode, request in runs:
+        server.reset()
+        started = time.perf_counter()
+        latencies, failures = run_burst(terms, request)
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        p50, p95, p99 = (percentile(latencies, fraction) for fraction in (0.5, 0.95, 0.99))
+        print(f"{mode:<9} {server.calls:>6} {server.prompts:>8} {server.calls / elapsed * 60:>10.0f} "
+              f"{p50:>7.2f} {p95:>7.2f} {p99:>7.2f} {len(failures):>7}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
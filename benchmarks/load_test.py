@@ -0,0 +1,348 @@
+"""Concurrent-session load generator for capacity planning
+
+Starts the app with `streamlit run` (or targets a running server with --url)
+and connects many simulated students to it over Streamlit's websocket
+protocol, the way browsers do. Each session walks the real pages - home page,
+profile form, term lookup and market ranges - sending its widget changes as
+rerun requests and timing each rerun until the server reports the script
+finished. Sessions share the server process - its st.cache_resource objects,
+profile store and GIL - exactly as real students do. Browser rendering is not
+included. The simulated clients run on threads of this process; on a small
+machine they compete with the server for CPU, so for planning numbers run the
+generator on other cores or another machine and point it at the server with
+--url.
+
+For each concurrency level it reports reruns/sec, latency percentiles and the
+server's RSS growth per session (when it runs locally), then names the knee:
+the last level where adding sessions still bought meaningfully more throughput.
+
+Uses the websockets package, which Streamlit itself depends on.
+
+Usage:
+    python benchmarks/load_test.py --levels 1 10 50 100 200 --duration 30
+    python benchmarks/load_test.py --url http://10.0.0.5:8501 --levels 10 50 100
+"""
+import argparse
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+from websockets.sync.client import connect
+
+from harness import ROOT, summarize
+from page_bench import HISTORY_RANGES, INCOME_BRACKETS, SEARCH_TERMS
+from perf import percentile
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+
+class SessionClient:
+    """One browser-like session: a websocket to the server plus the widget values it has set
+
+    Widgets are addressed by their key, or by label when they have none.
+    Values set with set() are sent with every rerun of the page, as the
+    browser does; clicks are sent once. Like the browser, a rerun caused only
+    by widgets inside one st.fragment reruns just that fragment.
+    """
+
+    def __init__(self, connection, timeout=120):
+        self.connection = connection
+        self.timeout = timeout
+        self.pages = {"": ""}  # URL path -> page script hash, filled in by the server
+        self.page = ""
+        self.widgets = {}
+        self.states = {}
+        self.fragments = {}  # widget id -> id of the fragment it was drawn in
+        self._changed = set()
+
+    def open(self, page):
+        """Navigate to a page by URL path ("" for the home page)"""
+        self.page = page
+        self.widgets, self.states, self.fragments = {}, {}, {}
+        self._changed.clear()
+        self.rerun()
+
+    def set(self, name, value):
+        """Set a widget's value (as the string the widget serializes to) for this and later reruns"""
+        state = WidgetState(id=self.widgets[name])
+        state.string_value = value
+        self.states[state.id] = state
+        self._changed.add(state.id)
+
+    def rerun(self, clicks=()):
+        """Rerun the current page, clicking the named buttons; returns once the script finishes"""
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.page_script_hash = self.pages[self.page]
+        client_state.widget_states.widgets.extend(self.states.values())
+        for name in clicks:
+            client_state.widget_states.widgets.add(id=self.widgets[name], trigger_value=True)
+            self._changed.add(self.widgets[name])
+        fragment_ids = {self.fragments.get(widget_id, "") for widget_id in self._changed}
+        if len(fragment_ids) == 1:
+            client_state.fragment_id = fragment_ids.pop()
+        self._changed.clear()
+        self.connection.send(message.SerializeToString())
+        self._wait()
+
+    def _wait(self):
+        seen = {}
+        fragments = {}
+        error = None
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(self.connection.recv(self.timeout))
+            kind = message.WhichOneof("type")
+            if kind == "navigation":
+                self.pages.update((page.url_pathname, page.page_script_hash) for page in message.navigation.app_pages)
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_type = element.WhichOneof("type")
+                proto = getattr(element, element_type)
+                if element_type == "exception":
+                    error = error or f"{proto.type}: {proto.message}"
+                widget_id = getattr(proto, "id", "")
+                if widget_id.startswith("$$ID-"):
+                    fragments[widget_id] = message.delta.fragment_id
+                    key = widget_id.split("-", 2)[2]
+                    seen[getattr(proto, "label", "") or key] = widget_id
+                    if key != "None":
+                        seen[key] = widget_id
+            elif kind == "script_finished":
+                # A script that calls st.rerun() finishes early and starts again
+                if message.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    seen, fragments, error = {}, {}, None
+                    continue
+                break
+        if message.script_finished == ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY:
+            # Only the fragment was redrawn; the rest of the page is unchanged
+            self.widgets.update(seen)
+            self.fragments.update(fragments)
+        else:
+            self.widgets, self.fragments = seen, fragments
+            # Widgets that are no longer on the page drop their values, as in the browser
+            live = set(seen.values())
+            self.states = {widget_id: state for widget_id, state in self.states.items() if widget_id in live}
+        if error:
+            raise RuntimeError(error)
+        if message.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+            raise RuntimeError("script failed to compile")
+
+
+def connect_session(url, timeout=120):
+    """Open a websocket to a Streamlit server's session stream, to use as a context manager"""
+    return connect(f"{url.replace('http', 'ws', 1).rstrip('/')}/_stcore/stream",
+                   subprotocols=["streamlit"], max_size=None, open_timeout=timeout)
+
+
+def term_search_step(session, i):
+    # Alternate between typing a search and following a related-term link
+    if i % 2 == 0:
+        session.set("term_query", SEARCH_TERMS[(i // 2) % len(SEARCH_TERMS)])
+        session.rerun()
+    else:
+        session.rerun(clicks=["related_0"])
+
+
+def profile_form_step(session, i):
+    # Alternate between submitting the profile form and reopening it with Edit
+    if "Save My Profile" in session.widgets:
+        session.set("Name", "Load Test Student")
+        session.set("Monthly Income", INCOME_BRACKETS[(i // 2) % len(INCOME_BRACKETS)])
+        session.rerun(clicks=["Save My Profile"])
+    else:
+        session.rerun(clicks=["edit_profile_button"])
+
+
+def market_tabs_step(session, i):
+    session.set("history_range", HISTORY_RANGES[i % len(HISTORY_RANGES)])
+    session.rerun()
+
+
+# One walk through the app: (page URL path, interactions to perform there)
+FLOW = [
+    ("", []),
+    ("Know_Your_Finances", [profile_form_step, profile_form_step]),
+    ("Financial_Information", [term_search_step, term_search_step]),
+    ("Current_Market", [market_tabs_step, market_tabs_step])
+]
+
+
+def rss_bytes(pid):
+    """Resident set size of a local process, or None where /proc isn't available"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return None
+
+
+def start_server(timeout=60):
+    """Run the app with `streamlit run` on a free local port; returns (process, base URL)"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+         "--server.address", "127.0.0.1", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit run exited with code {process.returncode}")
+        try:
+            if requests.get(f"{url}/_stcore/health", timeout=1).ok:
+                return process, url
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Streamlit server not healthy after {timeout}s")
+
+
+def simulate_session(url, deadline, release, durations, errors, lock):
+    """Connect, walk FLOW until deadline and stay connected until release is set"""
+    try:
+        with connect_session(url) as connection:
+            walk_flow(SessionClient(connection), deadline, durations, errors, lock)
+            release.wait()
+    except Exception as e:
+        with lock:
+            errors.append(f"session: {type(e).__name__}: {e}")
+
+
+def walk_flow(session, deadline, durations, errors, lock):
+    """Walk FLOW repeatedly until deadline, recording every rerun's latency"""
+    step_index = 0
+    while time.monotonic() < deadline:
+        for page, steps in FLOW:
+            elapsed = []
+            try:
+                started = time.perf_counter()
+                session.open(page)
+                elapsed.append(time.perf_counter() - started)
+
+                for step in steps:
+                    started = time.perf_counter()
+                    step(session, step_index)
+                    elapsed.append(time.perf_counter() - started)
+                    step_index += 1
+            except Exception as e:
+                with lock:
+                    errors.append(f"/{page}: {type(e).__name__}: {e}")
+                    durations.extend(elapsed)
+                continue
+
+            with lock:
+                durations.extend(elapsed)
+            if time.monotonic() >= deadline:
+                break
+
+
+def run_level(url, sessions, duration, server_pid=None):
+    """Run `sessions` concurrent sessions for `duration` seconds"""
+    durations, errors = [], []
+    lock = threading.Lock()
+    release = threading.Event()
+    rss_before = rss_bytes(server_pid) if server_pid else None
+
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=simulate_session, args=(url, deadline, release, durations, errors, lock), daemon=True)
+        for _ in range(sessions)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    # Sessions stay connected past the deadline until the server's RSS is measured
+    while time.monotonic() < deadline:
+        time.sleep(min(1.0, max(0.0, deadline - time.monotonic())))
+    with lock:
+        elapsed = time.monotonic() - started
+        reruns = len(durations)
+    rss_after = rss_bytes(server_pid) if server_pid else None
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    ordered = sorted(durations)
+    result = summarize(durations) if durations else {"median_ms": float("nan"), "p95_ms": float("nan")}
+    result.update({
+        "sessions": sessions,
+        "reruns": reruns,
+        "reruns_per_sec": reruns / elapsed,
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2) if ordered else float("nan"),
+        "rss_mib": rss_after / 2 ** 20 if rss_after else None,
+        "rss_per_session_kib": (rss_after - rss_before) / 1024 / sessions if rss_after and rss_before else None,
+        "errors": errors
+    })
+    return result
+
+
+def find_knee(results, min_gain):
+    """Return the last level whose throughput beat the previous level by at least min_gain"""
+    knee = results[0]
+    for previous, current in zip(results, results[1:]):
+        if current["reruns_per_sec"] < previous["reruns_per_sec"] * (1 + min_gain):
+            break
+        knee = current
+    return knee
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 5, 10, 25, 50, 100, 200],
+                        help="concurrent session counts to test, in increasing order")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run each level")
+    parser.add_argument("--warmup", type=float, default=5,
+                        help="seconds of one unmeasured session first, so imports and caches don't count as growth")
+    parser.add_argument("--knee-gain", type=float, default=0.1,
+                        help="minimum throughput gain between levels that still counts as scaling")
+    parser.add_argument("--url", help="base URL of a running server (default: start one with streamlit run)")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_server()
+        print(f"Started streamlit run app.py at {url} (pid {process.pid})\n")
+    server_pid = process.pid if process else None
+
+    try:
+        if args.warmup > 0:
+            run_level(url, 1, args.warmup)
+
+        print(f"{'sessions':>8} {'reruns/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+              f"{'RSS MiB':>8} {'KiB/sess':>9} {'errors':>7}")
+        results = []
+        for sessions in sorted(args.levels):
+            result = run_level(url, sessions, args.duration, server_pid)
+            results.append(result)
+            rss = f"{result['rss_mib']:>8.1f}" if result["rss_mib"] is not None else f"{'-':>8}"
+            per_session = (f"{result['rss_per_session_kib']:>9.1f}" if result["rss_per_session_kib"] is not None
+                           else f"{'-':>9}")
+            print(f"{sessions:>8} {result['reruns_per_sec']:>9.1f} {result['median_ms']:>9.1f} "
+                  f"{result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} {rss} {per_session} {len(result['errors']):>7}")
+            for error in result["errors"][:3]:
+                print(f"         ! {error}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(10)
+
+    knee = find_knee(results, args.knee_gain)
+    print(f"\nKnee: ~{knee['sessions']} concurrent sessions "
+          f"({knee['reruns_per_sec']:.1f} reruns/s, p95 {knee['p95_ms']:.0f} ms). "
+          f"Beyond this, extra sessions mostly add latency rather than throughput.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Local stand-in for the OpenAI-compatible Palmyra-Fin endpoint
+
+Serves POST /v1/chat/completions (plain and streamed) and the legacy
+POST /v1/completions with a list of prompts, so the gateway's micro-batching
+can be exercised. Each generation waits --ttft seconds for its first token
+and --token-delay seconds per token after that, and at most --capacity
+generations run at once (a batch counts as one, like a batched forward pass
+on a shared GPU); the rest wait their turn. GET /stats returns how many
+upstream calls and prompts the server has seen.
+
+Point the app at it by setting LLM_CONFIG["enabled"] = True and
+LLM_CONFIG["base_url"] = "http://127.0.0.1:8001/v1".
+
+Usage:
+    python benchmarks/mock_llm_server.py --port 8001 --ttft 0.4 --token-delay 0.02
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # A whole class connects at once; the default backlog of 5 would reset most of them
+    request_queue_size = 1024
+
+    def __init__(self, address, ttft=0.4, token_delay=0.02, tokens=40, capacity=8):
+        super().__init__(address, MockLLMHandler)
+        self.ttft = ttft
+        self.token_delay = token_delay
+        self.tokens = tokens
+        self.slots = threading.BoundedSemaphore(capacity)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.prompts = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def handle_error(self, request, client_address):
+        # Clients closing a kept-alive connection is routine, not worth a traceback
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def count(self, prompts):
+        with self.lock:
+            self.calls += 1
+            self.prompts += prompts
+
+    def reset(self):
+        with self.lock:
+            self.calls = 0
+            self.prompts = 0
+
+    def answer(self, prompt):
+        """A deterministic answer of self.tokens words that echoes the prompt"""
+        words = f"Mock answer to: {prompt}".split()
+        return [f"{words[i % len(words)]} " for i in range(self.tokens)]
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") != "/stats":
+            self.send_error(404)
+            return
+        with self.server.lock:
+            self._send_json({"calls": self.server.calls, "prompts": self.server.prompts})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        server = self.server
+        if self.path.endswith("/chat/completions"):
+            server.count(1)
+            tokens = server.answer(body["messages"][-1]["content"])
+            with server.slots:
+                time.sleep(server.ttft)
+                if body.get("stream"):
+                    self._stream(tokens)
+                else:
+                    time.sleep(server.token_delay * (len(tokens) - 1))
+                    self._send_json({"choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}}]})
+        elif self.path.endswith("/completions"):
+            prompts = body["prompt"] if isinstance(body["prompt"], list) else [body["prompt"]]
+            server.count(len(prompts))
+            answers = [server.answer(prompt.rsplit("User: ", 1)[-1]) for prompt in prompts]
+            with server.slots:
+                time.sleep(server.ttft + server.token_delay * (server.tokens - 1))
+            self._send_json({"choices": [{"index": i, "text": "".join(tokens)} for i, tokens in enumerate(answers)]})
+        else:
+            self.send_error(404)
+
+    def _stream(self, tokens):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.server.token_delay)
+            self._write_chunk(f"data: {json.dumps({'choices': [{'index': 0, 'delta': {'content': token}}]})}\n\n")
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def start_mock_server(port=0, **options):
+    """Start a MockLLMServer on a daemon thread; port 0 picks a free port"""
+    server = MockLLMServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--ttft", type=float, default=0.4, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between tokens")
+    parser.add_argument("--tokens", type=int, default=40, help="tokens per answer")
+    parser.add_argument("--capacity", type=int, default=8, help="generations served at once")
+    args = parser.parse_args()
+
+    server = MockLLMServer(("127.0.0.1", args.port), args.ttft, args.token_delay, args.tokens, args.capacity)
+    print(f"Mock LLM serving at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
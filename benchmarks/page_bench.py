@@ -0,0 +1,208 @@
+"""Headless rerun benchmarks for every page script
+
+Each scenario opens a page in Streamlit's AppTest and repeats one common
+interaction, timing every rerun. Peak Python memory is measured separately
+with tracemalloc so its overhead doesn't skew the latency numbers.
+
+Absolute times vary from machine to machine, so every measured rerun is
+paired with a rerun of a plain reference page, and each scenario's median is
+gated as a ratio to the reference median against benchmarks/baseline.json.
+p95 is reported for information only; over a few dozen reruns it is too
+noisy to fail a run on. Peak memory is gated directly.
+
+Usage:
+    python benchmarks/page_bench.py                     # run and compare to the baseline
+    python benchmarks/page_bench.py --update-baseline   # run and store results as the baseline
+    python benchmarks/page_bench.py term_search         # run selected scenarios only
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from harness import ROOT, check_run, find_button, open_page, summarize
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+SEARCH_TERMS = ["Budgeting", "credit score", "Student Loans", "compound interest"]
+INCOME_BRACKETS = ["$501-1000", "$2001-3000"]
+HISTORY_RANGES = ["1M", "1Y", "10Y"]
+
+
+def home_step(app, i):
+    app.run()
+
+
+def term_search_step(app, i):
+    # Alternate between typing a search and following a related-term link
+    if i % 2 == 0:
+        app.text_input(key="term_query").input(SEARCH_TERMS[(i // 2) % len(SEARCH_TERMS)]).run()
+    else:
+        app.button(key="related_0").click().run()
+
+
+def profile_form_step(app, i):
+    # Alternate between submitting the profile form and reopening it with Edit
+    if any(button.label == "Save My Profile" for button in app.button):
+        app.text_input[0].input("Benchmark Student")
+        for selectbox in app.selectbox:
+            if selectbox.label == "Monthly Income":
+                selectbox.set_value(INCOME_BRACKETS[(i // 2) % len(INCOME_BRACKETS)])
+        find_button(app, "Save My Profile").click().run()
+    else:
+        app.button(key="edit_profile_button").click().run()
+
+
+def market_tabs_step(app, i):
+    app.radio(key="history_range").set_value(HISTORY_RANGES[i % len(HISTORY_RANGES)]).run()
+
+
+# A plain page of app-free widgets, timed in the same run so scenario medians
+# can be compared across machines as a ratio to it. It renders enough elements
+# that its own median is stable from run to run.
+REFERENCE_SCRIPT = """
+import streamlit as st
+
+st.title("Reference")
+for i in range(40):
+    st.markdown(f"Row **{i}**")
+    st.text_input("Name", key=f"name_{i}")
+st.button("Go")
+"""
+
+
+# name -> (page script, step run once per measured rerun)
+SCENARIOS = {
+    "home": ("app.py", home_step),
+    "term_search": ("pages/01_Financial_Information.py", term_search_step),
+    "profile_form": ("pages/02_Know_Your_Finances.py", profile_form_step),
+    "market_tabs": ("pages/03_Current_Market.py", market_tabs_step)
+}
+
+
+def open_reference():
+    """Open an AppTest session on REFERENCE_SCRIPT"""
+    from streamlit.testing.v1 import AppTest
+
+    return check_run(AppTest.from_string(REFERENCE_SCRIPT).run())
+
+
+def run_scenario(page, step, reference, iterations, warmup, memory_iterations):
+    """Run one scenario; returns median/p95 rerun latency, the reference median and peak traced memory
+
+    Each measured rerun is paired with a rerun of the reference session, so
+    both medians come from the same stretch of machine time.
+    """
+    app = check_run(open_page(page).run())
+
+    for i in range(warmup):
+        step(app, i)
+        check_run(app)
+        check_run(reference.run())
+
+    durations, reference_durations = [], []
+    for i in range(warmup, warmup + iterations):
+        started = time.perf_counter()
+        step(app, i)
+        durations.append(time.perf_counter() - started)
+        check_run(app)
+
+        started = time.perf_counter()
+        reference.run()
+        reference_durations.append(time.perf_counter() - started)
+        check_run(reference)
+
+    tracemalloc.start()
+    try:
+        for i in range(memory_iterations):
+            step(app, i)
+            check_run(app)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = summarize(durations)
+    result["reference_ms"] = summarize(reference_durations)["median_ms"]
+    result["peak_kib"] = round(peak / 1024, 1)
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Return a message for every scenario that regressed past tolerance
+
+    Medians are compared as a ratio to the reference median measured alongside
+    them; peak memory is compared directly. p95 is not gated.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+
+        ratio = result["median_ms"] / result["reference_ms"]
+        expected_ratio = expected["median_ms"] / expected["reference_ms"]
+        limit = expected_ratio * (1 + tolerance)
+        if ratio > limit:
+            regressions.append(f"{name}: median {ratio:.2f}x reference > {limit:.2f}x "
+                               f"(baseline {expected_ratio:.2f}x)")
+
+        limit = expected["peak_kib"] * (1 + tolerance)
+        if result["peak_kib"] > limit:
+            regressions.append(f"{name}: peak_kib {result['peak_kib']} > {limit:.1f} "
+                               f"(baseline {expected['peak_kib']})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--iterations", type=int, default=60, help="measured reruns per scenario")
+    parser.add_argument("--warmup", type=int, default=3, help="unmeasured reruns before timing")
+    parser.add_argument("--memory-iterations", type=int, default=5, help="reruns traced for peak memory")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression as a fraction of baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    reference = open_reference()
+    results = {}
+    for name in args.scenarios or list(SCENARIOS):
+        page, step = SCENARIOS[name]
+        results[name] = run_scenario(page, step, reference, args.iterations, args.warmup, args.memory_iterations)
+        result = results[name]
+        print(f"{name:<14} median {result['median_ms']:>8.1f} ms   p95 {result['p95_ms']:>8.1f} ms   "
+              f"reference {result['reference_ms']:>6.1f} ms   peak {result['peak_kib']:>10.1f} KiB")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline updated: {BASELINE_PATH}")
+        return
+
+    if not os.path.exists(BASELINE_PATH):
+        print("\nNo baseline stored yet; run with --update-baseline to create one.")
+        return
+
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if regressions:
+        print("\nPerformance regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
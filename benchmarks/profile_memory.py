@@ -0,0 +1,138 @@
+"""Per-session memory and CPU cost of the profile representation
+
+Builds the session state for many simulated students twice: once in the old
+layout (eight session_state entries holding display strings and a goal list)
+and once as a single StudentProfile. For each it reports the traced memory per
+session and the CPU time to score, bucket and pick action items for every
+session, which is the work the Know Your Finances page repeats on each rerun.
+
+Usage:
+    python benchmarks/profile_memory.py --sessions 10000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+# Imported only so it puts the repository root on sys.path; the app modules
+# below are not importable from benchmarks/ without it
+import harness  # noqa: F401
+from config import PROFILE_OPTIONS
+from scoring import allocation_bucket, score_profile
+from student_profile import StudentProfile
+
+# The point tables the original calculate_financial_score() looked display strings up in
+LEGACY_SAVINGS_POINTS = {"$0-100": 0, "$101-500": 5, "$501-1000": 10, "$1001-5000": 15, "$5000+": 20}
+LEGACY_DEBT_POINTS = {"None": 0, "Less than $1000": -5, "$1000-5000": -10, "$5001-25000": -15, "$25000+": -20}
+LEGACY_INCOME_POINTS = {"$0-500": 5, "$501-1000": 10, "$1001-2000": 15, "$2001-3000": 20, "$3000+": 25}
+
+
+def random_answers(count, seed):
+    """Draw (name, age, status, income, savings, debt, goals) form answers"""
+    rng = random.Random(seed)
+    return [(
+        f"Student {i}",
+        rng.randint(16, 40),
+        rng.choice(PROFILE_OPTIONS["status"]),
+        rng.choice(PROFILE_OPTIONS["income"]),
+        rng.choice(PROFILE_OPTIONS["savings"]),
+        rng.choice(PROFILE_OPTIONS["debt"]),
+        rng.sample(PROFILE_OPTIONS["goals"], rng.randint(1, 3))
+    ) for i in range(count)]
+
+
+def legacy_session(answers):
+    name, age, status, income, savings, debt, goals = answers
+    return {
+        "user_name": name,
+        "user_age": age,
+        "user_status": status,
+        "user_income": income,
+        "user_savings": savings,
+        "user_debt": debt,
+        "user_goals": list(goals),
+        "profile_complete": True
+    }
+
+
+def typed_session(answers):
+    return {"student_profile": StudentProfile.from_labels(*answers)}
+
+
+def legacy_recommend(state):
+    """Score, allocation bucket and action item count as the original page computed them from display strings"""
+    # calculate_financial_score()
+    score = 50
+    score += LEGACY_SAVINGS_POINTS.get(state["user_savings"], 0)
+    score += LEGACY_DEBT_POINTS.get(state["user_debt"], 0)
+    score += LEGACY_INCOME_POINTS.get(state["user_income"], 0)
+    score = max(0, min(100, score))
+
+    # get_savings_allocation()
+    if state["user_debt"] in ["$5001-25000", "$25000+"]:
+        bucket = "Debt-Focused"
+    elif state["user_income"] in ["$0-500", "$501-1000"]:
+        bucket = "Simplified"
+    else:
+        bucket = "Balanced"
+
+    items = 0
+    if state["user_savings"] in ["$0-100", "$101-500"]:
+        items += 1
+    if state["user_debt"] not in ["None", "Less than $1000"]:
+        items += 1
+    if state["user_income"] in ["$1001-2000", "$2001-3000", "$3000+"] and state["user_savings"] in ["$0-100", "$101-500"]:
+        items += 1
+    return score, bucket, items
+
+
+def typed_recommend(state):
+    """Score, allocation bucket and action item count as computed from a StudentProfile"""
+    profile = state["student_profile"]
+    score = score_profile(profile.savings, profile.debt, profile.income)
+    bucket = allocation_bucket(profile.debt, profile.income)
+    items = profile.low_savings + profile.significant_debt + (profile.steady_income and profile.low_savings)
+    return score, bucket, items
+
+
+def measure(build, recommend, answers, repeats):
+    """Return (traced bytes per session, CPU microseconds per session rerun, results)"""
+    tracemalloc.start()
+    try:
+        sessions = [build(entry) for entry in answers]
+        traced, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # The outer list is common to both layouts, so leave it out of the per-session cost
+    traced -= sessions.__sizeof__()
+
+    started = time.process_time()
+    for _ in range(repeats):
+        results = [recommend(state) for state in sessions]
+    cpu = time.process_time() - started
+    return traced / len(sessions), cpu / (repeats * len(sessions)) * 1e6, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000, help="number of simulated sessions")
+    parser.add_argument("--repeats", type=int, default=5, help="reruns to time per session")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    answers = random_answers(args.sessions, args.seed)
+    legacy_bytes, legacy_us, legacy_results = measure(legacy_session, legacy_recommend, answers, args.repeats)
+    typed_bytes, typed_us, typed_results = measure(typed_session, typed_recommend, answers, args.repeats)
+    if legacy_results != typed_results:
+        raise SystemExit("StudentProfile recommendations differ from the string-based ones")
+
+    print(f"{args.sessions:,} sessions")
+    print(f"{'layout':<16} {'bytes/session':>14} {'total MiB':>10} {'CPU us/rerun':>13}")
+    for layout, per_session, cpu_us in (("session strings", legacy_bytes, legacy_us),
+                                        ("StudentProfile", typed_bytes, typed_us)):
+        print(f"{layout:<16} {per_session:>14.0f} {per_session * args.sessions / 2 ** 20:>10.2f} {cpu_us:>13.2f}")
+    print(f"\nSaved {1 - typed_bytes / legacy_bytes:.0%} memory and {1 - typed_us / legacy_us:.0%} CPU per session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Cold-start timing and import profiling for every page script
+
+Each page runs once in a fresh interpreter under Streamlit's AppTest with
+`python -X importtime`, so the numbers include every module the page pulls in.
+
+Usage:
+    python benchmarks/startup.py              # check each page against STARTUP_BUDGET_MS
+    python benchmarks/startup.py --profile    # also list the costliest imports per page
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import STARTUP_BUDGET_MS
+
+PAGE_START = "flex-startup:page-start"
+PAGE_END = "flex-startup:page-end"
+
+# Run in the child interpreter. The harness is imported before the start
+# marker so only imports triggered by the page itself are attributed to it.
+CHILD_SCRIPT = """
+import sys
+import time
+from streamlit.testing.v1 import AppTest
+
+# Start from app.py, like `streamlit run app.py`, so page links resolve
+app = AppTest.from_file({main!r}, default_timeout=120)
+if {path!r} != "app.py":
+    app.switch_page({path!r})
+print({start!r}, file=sys.stderr, flush=True)
+started = time.perf_counter()
+app.run()
+elapsed = time.perf_counter() - started
+print({end!r}, file=sys.stderr, flush=True)
+if app.exception:
+    print("page raised: " + app.exception[0].message, file=sys.stderr)
+    sys.exit(1)
+print(elapsed)
+"""
+
+
+def parse_importtime(lines):
+    """Parse `-X importtime` lines into (module, self_us, cumulative_us, depth) tuples"""
+    imports = []
+    for line in lines:
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def measure_page(path):
+    """Cold-start one page; returns (run seconds, page imports) or raises RuntimeError"""
+    code = CHILD_SCRIPT.format(main=os.path.join(ROOT, "app.py"), path=path, start=PAGE_START, end=PAGE_END)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    stderr = result.stderr.splitlines()
+    if result.returncode != 0:
+        raise RuntimeError("\n".join(stderr[-20:]))
+
+    start = stderr.index(PAGE_START)
+    end = stderr.index(PAGE_END)
+    return float(result.stdout.strip().splitlines()[-1]), parse_importtime(stderr[start + 1:end])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", action="store_true", help="list the costliest imports for each page")
+    parser.add_argument("--top", type=int, default=10, help="number of imports to list with --profile")
+    parser.add_argument("pages", nargs="*", help="page scripts to check (default: every budgeted page)")
+    args = parser.parse_args()
+
+    over_budget = []
+    for page in args.pages or list(STARTUP_BUDGET_MS):
+        try:
+            elapsed, imports = measure_page(page)
+        except RuntimeError as e:
+            print(f"{page}: failed to run\n{e}")
+            over_budget.append(page)
+            continue
+
+        elapsed_ms = elapsed * 1000
+        import_ms = sum(cumulative for _, _, cumulative, depth in imports if depth == 0) / 1000
+        budget_ms = STARTUP_BUDGET_MS.get(page)
+        status = "ok" if budget_ms is None or elapsed_ms <= budget_ms else "OVER BUDGET"
+        budget_text = f"{budget_ms} ms" if budget_ms is not None else "none"
+        print(f"{page}: {elapsed_ms:.0f} ms cold run, {import_ms:.0f} ms in {len(imports)} imports "
+              f"(budget {budget_text}) {status}")
+        if status != "ok":
+            over_budget.append(page)
+
+        if args.profile:
+            # Outermost imports carry the cost of everything they pull in
+            for name, _, cumulative, _ in sorted(
+                (entry for entry in imports if entry[3] == 0), key=lambda entry: -entry[2]
+            )[:args.top]:
+                print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+    if over_budget:
+        print(f"\n{len(over_budget)} page(s) over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
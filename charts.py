@@ -0,0 +1,109 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+
+def lttb_indices(x, y, threshold):
+    """Return the indices of the points largest-triangle-three-buckets keeps
+
+    x and y are float arrays of equal length with x ascending. The first and
+    last points are always kept; every bucket in between contributes the point
+    forming the largest triangle with the previous pick and the next bucket's mean.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    bucket_size = (n - 2) / (threshold - 2)
+
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def downsample_frame(df, x, y_columns, max_points):
+    """Downsample a wide frame with LTTB so the line chart gets at most max_points rows
+
+    Each series keeps its own share of the budget and the union of the kept
+    rows is returned, so every series stays aligned on the shared x column.
+    """
+    if len(df) <= max_points:
+        return df
+
+    x_values = df[x].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype("datetime64[ns]").astype(np.int64)
+    x_values = x_values.astype(float)
+
+    per_series = max(3, max_points // len(y_columns))
+    keep = np.unique(np.concatenate([
+        lttb_indices(x_values, df[column].to_numpy(dtype=float), per_series)
+        for column in y_columns
+    ]))
+    return df.iloc[keep]
+
+
+def frame_digest(df):
+    """Hash a frame's values, index and column names"""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(json.dumps([str(column) for column in df.columns]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """LRU cache of Plotly Express figures keyed by input frame and chart spec"""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_figure(self, kind, data, max_points=None, **spec):
+        """Return a cached px.<kind> figure for data and spec, building it on a miss
+
+        When max_points is given, the frame is LTTB-downsampled before plotting.
+        The returned figure is shared, so callers must not modify it.
+        """
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        key = (kind, frame_digest(df), max_points, json.dumps(spec, sort_keys=True, default=str))
+
+        with self._lock:
+            figure = self._figures.get(key)
+            if figure is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return figure
+            self.misses += 1
+
+        if max_points is not None:
+            y_columns = spec["y"] if isinstance(spec["y"], list) else [spec["y"]]
+            df = downsample_frame(df, spec["x"], y_columns, max_points)
+        figure = getattr(px, kind)(df, **spec)
+
+        with self._lock:
+            self._figures[key] = figure
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
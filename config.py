@@ -1,4 +1,14 @@
 # Application configuration settings
+import os
+
+# Filesystem locations
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+TERMS_DATA_PATH = os.path.join(DATA_DIR, "financial_terms.json")
+BANK_DATA_PATH = os.path.join(DATA_DIR, "bank_rates.json")
+LOAN_DATA_PATH = os.path.join(DATA_DIR, "loan_rates.json")
+QUOTES_FIXTURE_PATH = os.path.join(DATA_DIR, "fixtures", "quotes.json")
+PROFILE_DB_PATH = os.path.join(DATA_DIR, "profiles.db")
 
 # Default page title
 APP_TITLE = "FLex - Financial Literacy Assistant"
@@ -48,6 +58,23 @@ CUSTOM_CSS = """
 </style>
 """
 
+# Full-text term search: the BM25 index is persisted here and rebuilt when the catalog changes
+SEARCH_CONFIG = {
+    "index_path": os.path.join(DATA_DIR, "search_index.npz"),
+    "max_suggestions": 4,
+    # Shorter queries only suggest the titles they prefix instead of opening one
+    "min_prefix_length": 3
+}
+
+# Related-term graph: neighbours stored per term, embedding size and buttons shown
+RELATED_TERMS_CONFIG = {
+    "graph_path": os.path.join(DATA_DIR, "term_graph.npz"),
+    "neighbors": 8,
+    "dimensions": 1024,
+    "min_score": 0.2, # Cosine similarity below this is hashing noise (~1/sqrt(dimensions)), not relatedness
+    "display": 3
+}
+
 # Popular financial terms for quick access
 POPULAR_TERMS = [
     "Budgeting", 
@@ -69,16 +96,138 @@ PROFILE_OPTIONS = {
     "goals": ["Emergency Fund", "Pay Off Debt", "Save for Education", "Start Investing", "Major Purchase"]
 }
 
+# Simulated market tickers: fallback latest price (when there is no quote) plus daily drift and volatility
+MARKET_TICKERS = {
+    "S&P 500 (SPY)": {"symbol": "SPY", "start": 460, "drift": 0.0003, "volatility": 0.008},
+    "NASDAQ (QQQ)": {"symbol": "QQQ", "start": 440, "drift": 0.0004, "volatility": 0.01},
+    "Total Market (VTI)": {"symbol": "VTI", "start": 230, "drift": 0.0003, "volatility": 0.007}
+}
+
+# Local price history store and the chart ranges it serves (in days)
+HISTORY_CONFIG = {
+    "path": os.path.join(DATA_DIR, "history"),
+    "backfill_days": 3650,
+    "volatility_window": 21, # Daily returns in the rolling volatility shown on the index cards
+    "periods_per_year": 252 # Bars per year, for annualizing that volatility
+}
+HISTORY_RANGES = {"1M": 30, "1Y": 365, "10Y": 3650}
+
+# Bank product comparison: catalog_path (a CSV or column-oriented JSON file, e.g.
+# a full product export) replaces the bundled sample rates when set
+BANK_CATALOG_CONFIG = {
+    "catalog_path": None,
+    "page_size": 25,
+    "chart_top_k": 10
+}
+
+# Background market refresher: seconds between refreshes of each source (shared by
+# every session), and the retry backoff after an upstream error
+MARKET_REFRESH_CONFIG = {
+    "intervals": {"quotes": 60, "bank_rates": 3600, "loan_rates": 3600, "price_history": 3600},
+    "retry_seconds": 5,
+    "max_backoff_seconds": 900,
+    "first_load_timeout": 30 # Seconds the very first reader waits for a source
+}
+
+# News ingestion: feeds are RSS/Atom URLs; feed files in feed_dir are read too and
+# serve as the offline stand-in. Near-duplicate stories are merged via MinHash.
+NEWS_CONFIG = {
+    "feeds": [],
+    "feed_dir": os.path.join(DATA_DIR, "news"),
+    "state_path": os.path.join(DATA_DIR, "news_state.json"),
+    "poll_interval_seconds": 300,
+    "display_items": 5,
+    "store_size": 20,
+    "index_size": 500,
+    "duplicate_threshold": 0.6
+}
+
+# Student loan what-if grid: every loan type is amortized for each repayment
+# term (years) and extra monthly payment (dollars) below
+LOAN_SCENARIOS = {
+    "terms_years": [5, 10, 15, 20, 25],
+    "extra_payments": list(range(0, 501, 25)),
+    "default_principal": 30000
+}
+
+# Investment options projected on Know Your Finances: expected annual return and volatility
+INVESTMENT_OPTIONS = {
+    "High-Yield Savings": {"annual_return": 0.015, "volatility": 0.003},
+    "Index Funds": {"annual_return": 0.085, "volatility": 0.15},
+    "Target-Date Funds": {"annual_return": 0.075, "volatility": 0.10}
+}
+
+# Representative dollar amounts for each PROFILE_OPTIONS bracket, used as projection inputs
+BRACKET_AMOUNTS = {
+    "income": [250, 750, 1500, 2500, 4000],
+    "savings": [50, 300, 750, 3000, 7500]
+}
+
+# Monte Carlo projections, simulated batch_paths paths at a time
+PROJECTION_CONFIG = {
+    "paths": 10000,
+    "years": 10,
+    "contribution_rate": 0.10,
+    "batch_paths": 2500,
+    "seed": 7
+}
+
+# Chart rendering: line charts are downsampled to at most max_points rows
+CHART_CONFIG = {
+    "max_points": 1000,
+    "figure_cache_entries": 128
+}
+
+# Hot-path timing spans, shown in the ?debug=1 sidebar panel and exported for Prometheus
+PERF_CONFIG = {
+    "enabled": True,
+    "export_path": os.path.join(DATA_DIR, "metrics.prom"),
+    "export_interval_seconds": 15
+}
+
+# Cold-start budget per page script in milliseconds (checked by benchmarks/startup.py),
+# about 1.4x the slowest of repeated measured runs so an import regression trips it
+STARTUP_BUDGET_MS = {
+    "app.py": 400,
+    "pages/01_Financial_Information.py": 400,
+    "pages/02_Know_Your_Finances.py": 1050,
+    "pages/03_Current_Market.py": 1400
+}
+
 # API configuration (for future implementation)
 API_CONFIG = {
     "polygon_api_key": "", # To be filled when implemented
     "yahoo_finance_enabled": True,
-    "duckduckgo_enabled": True
+    "duckduckgo_enabled": True,
+    "market_data_provider": "fixture", # "polygon", "yahoo" or "fixture" (offline)
+    "quote_ttl_seconds": 60,
+    "max_fetch_workers": 4
 }
 
 # LLM configuration (for future implementation)
 LLM_CONFIG = {
+    "enabled": False, # Generate explanations for terms missing from the catalog
     "model": "Palmyra-Fin-70B-32K",
     "temperature": 0.7,
-    "max_tokens": 1024
+    "max_tokens": 1024,
+    "base_url": "https://integrate.api.nvidia.com/v1",
+    "api_key": "", # To be filled when implemented
+    "timeout": 60,
+    "max_parallel_requests": 4, # Upstream calls in flight at once
+    "max_queued_requests": 64, # Distinct prompts waiting for a slot before new ones are turned away
+    "queue_timeout": 30, # Seconds a prompt may wait for a slot
+    "batching": False, # Backend's /completions endpoint takes a list of prompts
+    "batch_size": 8,
+    "batch_wait_ms": 20,
+    "cache_path": os.path.join(DATA_DIR, "llm_cache"),
+    "cache_memory_entries": 256,
+    "cache_max_bytes": 50 * 1024 * 1024
+}
+
+# Background generation of content for the related terms shown under a generated term
+PREFETCH_CONFIG = {
+    "enabled": True,
+    "max_workers": 2,
+    "max_pending": 16, # Queued or running across all sessions
+    "session_budget": 20 # Generations one session may trigger
 }
\ No newline at end of file
@@ -0,0 +1,105 @@
+import json
+
+import requests
+
+# Bump whenever the prompt templates change so cached responses are regenerated
+PROMPT_VERSION = 1
+
+SYSTEM_PROMPT = (
+    "You are FLex, a friendly financial literacy assistant for students. "
+    "Explain things in plain language a first-year college student understands. "
+    "This is education, not financial advice."
+)
+
+PROMPTS = {
+    "content": (
+        "Explain the financial term \"{term}\" in two short paragraphs. "
+        "Use an everyday analogy and avoid jargon."
+    ),
+    "examples": (
+        "Give one realistic example of \"{term}\" in a student's life. "
+        "Start with **Student Example**: and use concrete dollar amounts."
+    )
+}
+
+
+class MalformedResponse(requests.RequestException):
+    """The endpoint answered 200 but the body is not a completion we can read; callers treat it as a failed request"""
+
+
+def build_messages(kind, term):
+    """Build the chat messages for one kind of term content"""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": PROMPTS[kind].format(term=term)}
+    ]
+
+
+class LLMClient:
+    """Minimal client for an OpenAI-compatible chat completions endpoint"""
+
+    def __init__(self, config):
+        self.model = config["model"]
+        self.temperature = config["temperature"]
+        self.max_tokens = config["max_tokens"]
+        self.url = f"{config['base_url'].rstrip('/')}/chat/completions"
+        self.batch_url = f"{config['base_url'].rstrip('/')}/completions"
+        self.timeout = config.get("timeout", 60)
+        self.session = requests.Session()
+        if config.get("api_key"):
+            self.session.headers["Authorization"] = f"Bearer {config['api_key']}"
+
+    def _payload(self, messages, stream):
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": stream
+        }
+
+    def complete(self, messages):
+        """Return the full completion text for a list of chat messages"""
+        response = self.session.post(self.url, json=self._payload(messages, False), timeout=self.timeout)
+        response.raise_for_status()
+        try:
+            return response.json()["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+            raise MalformedResponse(f"Unexpected completion response: {e!r}", response=response) from e
+
+    def complete_batch(self, conversations):
+        """Return one completion per chat conversation from a single legacy /completions request
+
+        Only for backends whose /completions endpoint takes a list of prompts;
+        each conversation is flattened into one plain-text prompt.
+        """
+        prompts = [
+            "\n\n".join(f"{message['role'].title()}: {message['content']}" for message in messages) + "\n\nAssistant:"
+            for messages in conversations
+        ]
+        payload = {"model": self.model, "prompt": prompts, "temperature": self.temperature, "max_tokens": self.max_tokens}
+        response = self.session.post(self.batch_url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        try:
+            choices = sorted(response.json()["choices"], key=lambda choice: choice["index"])
+            return [choice["text"].strip() for choice in choices]
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+            raise MalformedResponse(f"Unexpected batch completion response: {e!r}", response=response) from e
+
+    def stream(self, messages):
+        """Yield completion text chunks as the server-sent events arrive"""
+        with self.session.post(self.url, json=self._payload(messages, True), stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    delta = json.loads(data)["choices"][0].get("delta") or {}
+                    content = delta.get("content")
+                except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+                    raise MalformedResponse(f"Unexpected stream chunk: {data[:200]!r}", response=response) from e
+                if content:
+                    yield content
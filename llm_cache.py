@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+def make_cache_key(term, model, temperature, prompt_version, kind):
+    """Content-address a generated response by everything that shapes it"""
+    payload = json.dumps([term, model, temperature, prompt_version, kind], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache for generated text: an in-memory LRU over a size-bounded directory
+
+    Disk entries live at <root>/<key[:2]>/<key>.json. When the directory grows
+    past max_bytes, the least recently used files are evicted down to 90% of it.
+    """
+
+    def __init__(self, root, memory_entries=256, max_bytes=50 * 1024 * 1024):
+        self.root = root
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def _disk_entries(self):
+        """Yield (last used time, path, size) for every file in the disk tier"""
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    yield stat.st_mtime, entry.path, stat.st_size
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached text for key, or None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)["value"]
+            # Touch the file so eviction sees it as recently used
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits_disk += 1
+            self._remember(key, value)
+        return value
+
+    def __contains__(self, key):
+        """Check either tier for key without counting a hit or miss"""
+        with self._lock:
+            if key in self._memory:
+                return True
+        return os.path.exists(self._path(key))
+
+    def put(self, key, value):
+        """Store text under key in both tiers"""
+        path = self._path(key)
+        data = json.dumps({"value": value}).encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temp file and rename so readers never see a partial entry
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._remember(key, value)
+            self._disk_bytes += len(data) - previous
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used disk entries until under 90% of max_bytes"""
+        target = self.max_bytes * 0.9
+        for _, path, size in sorted(self._disk_entries()):
+            if self._disk_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._disk_bytes -= size
+            self.evictions += 1
+            self._memory.pop(os.path.basename(path)[:-len(".json")], None)
+
+    def stats(self):
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.hits_memory + self.hits_disk + self.misses
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes
+            }
@@ -0,0 +1,235 @@
+import queue
+import threading
+import time
+from collections import deque
+
+import requests
+
+
+class GatewayBusy(requests.RequestException):
+    """Too many distinct prompts are already waiting; raised instead of queueing more
+
+    A RequestException so callers that already handle network failures handle this too.
+    """
+
+
+class GatewayTimeout(requests.Timeout):
+    """A prompt waited too long for an upstream slot or for its next chunk"""
+
+
+class _Flight:
+    """One upstream generation and every caller waiting on it
+
+    The worker running the call publishes chunks as they arrive; each caller
+    replays them from the start, so late joiners still get the whole text.
+    """
+
+    def __init__(self, key, messages, stream, deadline):
+        self.key = key
+        self.messages = messages
+        self.stream = stream
+        self.deadline = deadline
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self._changed = threading.Condition()
+
+    def publish(self, chunk):
+        with self._changed:
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    def finish(self, error=None):
+        with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    def read(self, timeout):
+        """Yield chunks as they are published, raising the upstream error if the call failed"""
+        position = 0
+        while True:
+            with self._changed:
+                if not self._changed.wait_for(lambda: len(self.chunks) > position or self.done, timeout):
+                    raise GatewayTimeout(f"No response for {self.key!r} within {timeout}s")
+                chunks = self.chunks[position:]
+                done, error = self.done, self.error
+            position += len(chunks)
+            yield from chunks
+            if done and position == len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
+
+class LLMGateway:
+    """Single-flight, concurrency-limited front door for LLM requests
+
+    Requests are keyed (by response cache key), and a request whose key is
+    already being generated joins that call instead of making another, so a
+    whole class opening the same term costs one upstream call. Distinct
+    prompts wait in a queue of at most max_queued for one of max_concurrent
+    worker slots; past that they are turned away with GatewayBusy, and a
+    prompt still queued after queue_timeout fails with GatewayTimeout.
+    Finished text is written to cache before the key leaves the in-flight
+    table, so a later request always finds one or the other.
+
+    With batching on, non-streaming prompts that arrive within batch_wait of
+    each other go upstream together as one client.complete_batch() call.
+    """
+
+    def __init__(self, client, cache, max_concurrent=4, max_queued=64, queue_timeout=30.0,
+                 batching=False, batch_size=8, batch_wait=0.02):
+        self.client = client
+        self.cache = cache
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.requests = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.upstream_calls = 0
+        self.upstream_batches = 0
+        self._call_times = deque()
+        self._inflight = {}
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+
+        self._batchable = [] if batching else None
+        self._batch_ready = threading.Condition(self._lock)
+        for i in range(max_concurrent):
+            threading.Thread(target=self._work, name=f"llm-gateway-{i}", daemon=True).start()
+        if batching:
+            threading.Thread(target=self._batch, name="llm-gateway-batcher", daemon=True).start()
+
+    def stream(self, key, messages, stream=True):
+        """Yield the text for key as it is generated, sharing any call already in flight for it"""
+        with self._lock:
+            self.requests += 1
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+        if flight is None:
+            # Checked after the in-flight table: a call that just finished has already cached its text
+            if key in self.cache:
+                text = self.cache.get(key)
+                if text is not None:
+                    with self._lock:
+                        self.cache_hits += 1
+                    yield text
+                    return
+            flight = self._join_or_start(key, messages, stream)
+        yield from flight.read(self.queue_timeout + self.client.timeout)
+
+    def complete(self, key, messages):
+        """Return the full text for key, sharing any call already in flight for it"""
+        return "".join(self.stream(key, messages, stream=False))
+
+    def _join_or_start(self, key, messages, stream):
+        with self._lock:
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight
+            if self._queued >= self.max_queued:
+                self.rejected += 1
+                raise GatewayBusy(f"{self._queued} prompts already waiting for the LLM")
+            flight = self._inflight[key] = _Flight(key, messages, stream, time.monotonic() + self.queue_timeout)
+            self._queued += 1
+            if stream or self._batchable is None:
+                self._jobs.put([flight])
+            else:
+                self._batchable.append(flight)
+                self._batch_ready.notify()
+        return flight
+
+    def _batch(self):
+        """Gather non-streaming prompts for up to batch_wait, then queue them as one job"""
+        while True:
+            with self._batch_ready:
+                self._batch_ready.wait_for(lambda: self._batchable)
+            time.sleep(self.batch_wait)
+            with self._lock:
+                while self._batchable:
+                    self._jobs.put(self._batchable[:self.batch_size])
+                    del self._batchable[:self.batch_size]
+
+    def _work(self):
+        while True:
+            flights = self._jobs.get()
+            now = time.monotonic()
+            with self._lock:
+                self._queued -= len(flights)
+            live = []
+            for flight in flights:
+                if now > flight.deadline:
+                    with self._lock:
+                        self.timed_out += 1
+                    self._settle(flight, error=GatewayTimeout(f"{flight.key!r} waited over {self.queue_timeout}s for the LLM"))
+                else:
+                    live.append(flight)
+            if live:
+                self._call(live)
+
+    def _call(self, flights):
+        with self._lock:
+            self.upstream_calls += 1
+            self.upstream_batches += len(flights) > 1
+            self._call_times.append(time.monotonic())
+            self._trim_call_times()
+        # Stays set only if something beyond Exception (e.g. SystemExit) ends the call
+        error = RuntimeError("LLM call was interrupted")
+        try:
+            if len(flights) > 1:
+                texts = self.client.complete_batch([flight.messages for flight in flights])
+                if len(texts) != len(flights):
+                    raise ValueError(f"Batch of {len(flights)} prompts returned {len(texts)} completions")
+                for flight, text in zip(flights, texts):
+                    flight.publish(text)
+            elif flights[0].stream:
+                for chunk in self.client.stream(flights[0].messages):
+                    flights[0].publish(chunk)
+            else:
+                flights[0].publish(self.client.complete(flights[0].messages))
+            for flight in flights:
+                self.cache.put(flight.key, "".join(flight.chunks))
+            error = None
+        except Exception as e:
+            # Whatever failed (the call, the response or the cache), every caller
+            # sees it and the worker lives on for the next job
+            error = e
+        finally:
+            # Always settled, so no key is left in flight with callers waiting on it
+            for flight in flights:
+                self._settle(flight, error=error)
+
+    def _settle(self, flight, error=None):
+        with self._lock:
+            self._inflight.pop(flight.key, None)
+        flight.finish(error)
+
+    def _trim_call_times(self):
+        cutoff = time.monotonic() - 60
+        while self._call_times and self._call_times[0] < cutoff:
+            self._call_times.popleft()
+
+    def stats(self):
+        """Return request, coalescing and rejection counters and upstream calls over the last minute"""
+        with self._lock:
+            self._trim_call_times()
+            return {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "cache_hits": self.cache_hits,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "upstream_calls": self.upstream_calls,
+                "upstream_batches": self.upstream_batches,
+                "upstream_calls_last_minute": len(self._call_times),
+                "queued": self._queued,
+                "in_flight": len(self._inflight)
+            }
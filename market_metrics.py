@@ -0,0 +1,230 @@
+import datetime
+import math
+import operator
+from collections import deque
+
+import numpy as np
+
+# Windows are in calendar days, so gaps (weekends, holidays) don't stretch them
+WEEK_DAYS = 7
+YEAR_WINDOW_DAYS = 365
+
+
+def _as_date(value):
+    return value.item() if isinstance(value, np.datetime64) else value
+
+
+def _range_extreme(values, starts, ufunc):
+    """ufunc.reduce over values[starts[i]:i + 1] for every i, via a sparse table"""
+    n = len(values)
+    table = [values]
+    width = 1
+    while width * 2 <= n:
+        previous = table[-1]
+        table.append(ufunc(previous[:-width], previous[width:]))
+        width *= 2
+    padded = np.full((len(table), n), values[0], dtype=values.dtype)
+    for level, row in enumerate(table):
+        padded[level, :len(row)] = row
+
+    ends = np.arange(n)
+    level = np.floor(np.log2(ends - starts + 1)).astype(int)
+    return ufunc(padded[level, starts], padded[level, ends - (1 << level) + 1])
+
+
+def compute_metric_series(dates, closes, volatility_window=21, periods_per_year=252):
+    """Every rolling metric at every bar of a full history, in one vectorized pass
+
+    dates are ascending datetime64[D] and closes the matching prices. Returns
+    a dict of float arrays the length of closes, NaN where there isn't enough
+    history yet. RollingMetrics produces the same values one bar at a time.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    closes = np.asarray(closes, dtype=float)
+    n = len(closes)
+    index = np.arange(n)
+
+    daily = np.full(n, np.nan)
+    daily[1:] = closes[1:] / closes[:-1] - 1
+
+    # Weekly: against the latest bar at least a week old
+    week_ref = np.searchsorted(dates, dates - WEEK_DAYS, side="right") - 1
+    weekly = np.where(week_ref >= 0, closes / closes[np.maximum(week_ref, 0)] - 1, np.nan)
+
+    # YTD: against the last close of the previous year, or the year's first close without one
+    years = dates.astype("datetime64[Y]")
+    year_start = np.searchsorted(dates, years.astype("datetime64[D]"), side="left")
+    year_base = np.where(year_start > 0, year_start - 1, year_start)
+    ytd = closes / closes[year_base] - 1
+
+    log_returns = np.zeros(n)
+    log_returns[1:] = np.log(closes[1:] / closes[:-1])
+    sums = np.cumsum(log_returns)
+    squares = np.cumsum(log_returns ** 2)
+    volatility = np.full(n, np.nan)
+    if n > volatility_window:
+        window_sum = sums[volatility_window:] - sums[:-volatility_window]
+        window_squares = squares[volatility_window:] - squares[:-volatility_window]
+        variance = (window_squares - window_sum ** 2 / volatility_window) / (volatility_window - 1)
+        volatility[volatility_window:] = np.sqrt(np.maximum(variance, 0.0) * periods_per_year)
+
+    drawdown = closes / np.maximum.accumulate(closes) - 1
+    max_drawdown = np.minimum.accumulate(drawdown)
+
+    window_start = np.searchsorted(dates, dates - (YEAR_WINDOW_DAYS - 1), side="left")
+    return {
+        "close": closes,
+        "daily_return": daily,
+        "weekly_return": weekly,
+        "ytd_return": ytd,
+        "volatility": volatility,
+        "drawdown": drawdown,
+        "max_drawdown": max_drawdown,
+        "high_52w": _range_extreme(closes, np.minimum(window_start, index), np.maximum),
+        "low_52w": _range_extreme(closes, np.minimum(window_start, index), np.minimum)
+    }
+
+
+class RollingMetrics:
+    """Running statistics for one ticker, updated in O(1) (amortized) per new bar
+
+    Daily, weekly and year-to-date returns, annualized rolling volatility of
+    daily log returns, current and maximum drawdown and the 52-week high and
+    low. The 52-week extremes come from monotonic deques, volatility from a
+    window of running sums, so no update rescans history.
+    """
+
+    def __init__(self, volatility_window=21, periods_per_year=252):
+        self.volatility_window = volatility_window
+        self.periods_per_year = periods_per_year
+        self.date = None
+        self.close = None
+        self._previous_close = None
+        self._year_base = None
+        self._week = deque()
+        self._returns = deque()
+        self._return_sum = 0.0
+        self._return_squares = 0.0
+        self._peak = -np.inf
+        self._max_drawdown = 0.0
+        self._highs = deque()
+        self._lows = deque()
+
+    @classmethod
+    def from_history(cls, dates, closes, volatility_window=21, periods_per_year=252):
+        """Build the state for a full history, vectorized except for the trailing 52 weeks"""
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        closes = np.asarray(closes, dtype=float)
+        metrics = cls(volatility_window, periods_per_year)
+        if not len(closes):
+            return metrics
+
+        # Everything before the last year only feeds the peak, max drawdown and year base
+        replay_from = int(np.searchsorted(dates, dates[-1] - YEAR_WINDOW_DAYS, side="left"))
+        replay_from = min(replay_from, max(0, len(closes) - volatility_window - 1))
+        if replay_from > 0:
+            head = closes[:replay_from]
+            metrics._peak = float(head.max())
+            metrics._max_drawdown = float(np.min(head / np.maximum.accumulate(head) - 1))
+            metrics._previous_close = float(head[-1])
+            metrics.close = float(head[-1])
+            metrics.date = _as_date(dates[replay_from - 1])
+            year_start = np.searchsorted(dates, dates[replay_from - 1].astype("datetime64[Y]").astype("datetime64[D]"))
+            metrics._year_base = float(closes[year_start - 1] if year_start > 0 else closes[year_start])
+            # Seed the weekly lookback with the bars a week back from the replay start
+            week_start = int(np.searchsorted(dates, dates[replay_from - 1] - WEEK_DAYS, side="right")) - 1
+            for i in range(max(week_start, 0), replay_from):
+                metrics._week.append((_as_date(dates[i]), float(closes[i])))
+
+        for date, close in zip(dates[replay_from:], closes[replay_from:]):
+            metrics.update(_as_date(date), float(close))
+        return metrics
+
+    def update(self, date, close):
+        """Add the next bar; dates must be increasing"""
+        if self.date is not None and date <= self.date:
+            raise ValueError(f"Bar for {date} is not after {self.date}")
+
+        if self.date is None or date.year != self.date.year:
+            self._year_base = self.close if self.close is not None else close
+
+        # Weekly lookback: keep the newest bar at least a week old at the front
+        self._week.append((date, close))
+        cutoff = date - datetime.timedelta(days=WEEK_DAYS)
+        while len(self._week) > 1 and self._week[1][0] <= cutoff:
+            self._week.popleft()
+
+        if self.close is not None:
+            log_return = math.log(close / self.close)
+            self._returns.append(log_return)
+            self._return_sum += log_return
+            self._return_squares += log_return ** 2
+            if len(self._returns) > self.volatility_window:
+                dropped = self._returns.popleft()
+                self._return_sum -= dropped
+                self._return_squares -= dropped ** 2
+
+        self._peak = max(self._peak, close)
+        self._max_drawdown = min(self._max_drawdown, close / self._peak - 1)
+
+        # Monotonic deques: the front is the window's extreme, older dominated bars are dropped
+        window_start = date - datetime.timedelta(days=YEAR_WINDOW_DAYS - 1)
+        for extremes, dominated in ((self._highs, operator.le), (self._lows, operator.ge)):
+            while extremes and dominated(extremes[-1][1], close):
+                extremes.pop()
+            extremes.append((date, close))
+            while extremes[0][0] < window_start:
+                extremes.popleft()
+
+        self._previous_close, self.close, self.date = self.close, close, date
+
+    def snapshot(self):
+        """Current metrics as a plain dict; returns are fractions, None without enough history"""
+        if self.close is None:
+            return None
+        week_date, week_close = self._week[0]
+        volatility = None
+        if len(self._returns) == self.volatility_window:
+            n = self.volatility_window
+            variance = (self._return_squares - self._return_sum ** 2 / n) / (n - 1)
+            volatility = math.sqrt(max(variance, 0.0) * self.periods_per_year)
+        return {
+            "date": self.date,
+            "close": self.close,
+            "daily_return": self.close / self._previous_close - 1 if self._previous_close is not None else None,
+            "weekly_return": (self.close / week_close - 1
+                              if week_date <= self.date - datetime.timedelta(days=WEEK_DAYS) else None),
+            "ytd_return": self.close / self._year_base - 1,
+            "volatility": volatility,
+            "drawdown": self.close / self._peak - 1,
+            "max_drawdown": self._max_drawdown,
+            "high_52w": self._highs[0][1],
+            "low_52w": self._lows[0][1]
+        }
+
+
+class MarketMetrics:
+    """Rolling metrics for every ticker in a PriceHistoryStore, kept in step with it
+
+    The first sync backfills each ticker from its full stored history; later
+    syncs feed only the bars appended since, one O(1) update each.
+    """
+
+    def __init__(self, volatility_window=21, periods_per_year=252):
+        self.volatility_window = volatility_window
+        self.periods_per_year = periods_per_year
+        self._metrics = {}
+
+    def sync(self, store, symbols):
+        """Bring every symbol up to date with the store; returns {symbol: metrics snapshot}"""
+        for symbol in symbols:
+            metrics = self._metrics.get(symbol)
+            if metrics is None or metrics.date is None:
+                bars = store.read(symbol)
+                metrics = self._metrics[symbol] = RollingMetrics.from_history(
+                    bars["date"], bars["close"], self.volatility_window, self.periods_per_year
+                )
+            else:
+                for bar in store.read(symbol, start=metrics.date + datetime.timedelta(days=1)):
+                    metrics.update(bar["date"].item(), float(bar["close"]))
+        return {symbol: self._metrics[symbol].snapshot() for symbol in symbols}
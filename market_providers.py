@@ -0,0 +1,193 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class QuoteCache:
+    """Thread-safe per-symbol quote cache with a fixed time-to-live"""
+
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def split(self, symbols):
+        """Return (fresh cached quotes, symbols that need fetching)"""
+        now = time.monotonic()
+        fresh, missing = {}, []
+        with self._lock:
+            for symbol in symbols:
+                entry = self._entries.get(symbol)
+                if entry is not None and now - entry[0] < self.ttl_seconds:
+                    fresh[symbol] = entry[1]
+                else:
+                    missing.append(symbol)
+        return fresh, missing
+
+    def put_many(self, quotes):
+        """Store freshly fetched quotes"""
+        now = time.monotonic()
+        with self._lock:
+            for symbol, quote in quotes.items():
+                self._entries[symbol] = (now, quote)
+
+
+class MarketDataProvider:
+    """Base class for quote backends
+
+    Subclasses implement fetch_batch(), which fetches up to batch_size symbols
+    in a single upstream request and returns {symbol: quote}. A quote is a dict
+    with symbol, price, previous_close, change_percent and timestamp keys.
+    """
+
+    name = "base"
+    batch_size = 50
+
+    def __init__(self, ttl_seconds=60, max_workers=4):
+        self.cache = QuoteCache(ttl_seconds)
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def fetch_batch(self, symbols):
+        raise NotImplementedError
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=f"quotes-{self.name}"
+                )
+            return self._executor
+
+    def get_quotes(self, symbols):
+        """Return quotes for symbols, fetching only the ones not fresh in the cache"""
+        symbols = list(dict.fromkeys(symbols))
+        quotes, missing = self.cache.split(symbols)
+
+        if missing:
+            chunks = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+            if len(chunks) == 1:
+                results = [self.fetch_batch(chunks[0])]
+            else:
+                # Batches beyond the first go out concurrently on the shared pool
+                results = list(self._get_executor().map(self.fetch_batch, chunks))
+
+            fetched = {}
+            for result in results:
+                fetched.update(result)
+            self.cache.put_many(fetched)
+            quotes.update(fetched)
+
+        return {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+
+    def close(self):
+        """Release pooled resources"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+class HTTPMarketDataProvider(MarketDataProvider):
+    """Provider backed by a pooled, retrying requests.Session"""
+
+    timeout = 10
+
+    def __init__(self, ttl_seconds=60, max_workers=4):
+        super().__init__(ttl_seconds, max_workers)
+        self.session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get_json(self, url, params):
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        super().close()
+        self.session.close()
+
+
+class PolygonProvider(HTTPMarketDataProvider):
+    """Quotes from Polygon's multi-ticker snapshot endpoint"""
+
+    name = "polygon"
+    base_url = "https://api.polygon.io"
+
+    def __init__(self, api_key, ttl_seconds=60, max_workers=4):
+        super().__init__(ttl_seconds, max_workers)
+        self.api_key = api_key
+
+    def fetch_batch(self, symbols):
+        payload = self._get_json(
+            f"{self.base_url}/v2/snapshot/locale/us/markets/stocks/tickers",
+            {"tickers": ",".join(symbols), "apiKey": self.api_key}
+        )
+        quotes = {}
+        for item in payload.get("tickers", []):
+            day = item.get("day") or {}
+            previous = item.get("prevDay") or {}
+            price = (item.get("lastTrade") or {}).get("p") or day.get("c")
+            quotes[item["ticker"]] = {
+                "symbol": item["ticker"],
+                "price": price,
+                "previous_close": previous.get("c"),
+                "change_percent": item.get("todaysChangePerc"),
+                "timestamp": item.get("updated", 0) / 1e9
+            }
+        return quotes
+
+
+class YahooFinanceProvider(HTTPMarketDataProvider):
+    """Quotes from Yahoo Finance's multi-symbol quote endpoint"""
+
+    name = "yahoo"
+    base_url = "https://query1.finance.yahoo.com"
+
+    def fetch_batch(self, symbols):
+        payload = self._get_json(f"{self.base_url}/v7/finance/quote", {"symbols": ",".join(symbols)})
+        quotes = {}
+        for item in (payload.get("quoteResponse") or {}).get("result", []):
+            quotes[item["symbol"]] = {
+                "symbol": item["symbol"],
+                "price": item.get("regularMarketPrice"),
+                "previous_close": item.get("regularMarketPreviousClose"),
+                "change_percent": item.get("regularMarketChangePercent"),
+                "timestamp": item.get("regularMarketTime")
+            }
+        return quotes
+
+
+class FixtureProvider(MarketDataProvider):
+    """Offline stand-in serving quotes from a local JSON fixture"""
+
+    name = "fixture"
+    batch_size = 1000
+
+    def __init__(self, path, ttl_seconds=60, max_workers=1):
+        super().__init__(ttl_seconds, max_workers)
+        with open(path, encoding="utf-8") as f:
+            self._quotes = {quote["symbol"]: quote for quote in json.load(f)}
+
+    def fetch_batch(self, symbols):
+        return {symbol: self._quotes[symbol] for symbol in symbols if symbol in self._quotes}
+
+
+def create_provider(api_config, fixture_path):
+    """Create the provider selected by API_CONFIG, falling back to the offline fixture"""
+    name = api_config.get("market_data_provider", "fixture")
+    ttl_seconds = api_config.get("quote_ttl_seconds", 60)
+    max_workers = api_config.get("max_fetch_workers", 4)
+
+    if name == "polygon" and api_config.get("polygon_api_key"):
+        return PolygonProvider(api_config["polygon_api_key"], ttl_seconds, max_workers)
+    if name == "yahoo" and api_config.get("yahoo_finance_enabled"):
+        return YahooFinanceProvider(ttl_seconds, max_workers)
+    return FixtureProvider(fixture_path, ttl_seconds)
@@ -0,0 +1,138 @@
+import heapq
+import random
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+# One source's latest data: value is kept from the last successful refresh
+# while error, failures and next_attempt describe the attempts since
+SourceEntry = namedtuple("SourceEntry", ["value", "updated", "error", "failures", "next_attempt"])
+
+
+class MarketSnapshot:
+    """Immutable view of every source's latest entry at one moment
+
+    A page reads one snapshot and renders from it, so its sections never mix
+    data from before and after a refresh. Values are shared by every session
+    and must be treated as read-only.
+    """
+
+    def __init__(self, entries=None):
+        self._entries = MappingProxyType(dict(entries or {}))
+
+    def with_entry(self, name, entry):
+        return MarketSnapshot({**self._entries, name: entry})
+
+    def entry(self, name):
+        return self._entries.get(name)
+
+    def value(self, name, default=None):
+        entry = self._entries.get(name)
+        return default if entry is None or entry.updated is None else entry.value
+
+    def age(self, name, now=None):
+        """Seconds since name last refreshed successfully, or None if it never has"""
+        entry = self._entries.get(name)
+        if entry is None or entry.updated is None:
+            return None
+        return max(0.0, (now or time.time()) - entry.updated)
+
+
+class MarketRefresher:
+    """Refreshes market data sources on one background thread, on per-source intervals
+
+    Each source is a fetch() callable and an interval. The scheduler thread
+    runs whichever source is due next and swaps in a new MarketSnapshot, so
+    readers never wait on a refresh and see the previous data until it lands.
+    A fetch that raises keeps the last good value and retries after retry_seconds,
+    doubling (with jitter) on each consecutive failure up to max_backoff.
+    Upstream traffic is set by the intervals, not by how many sessions read.
+    """
+
+    def __init__(self, retry_seconds=5.0, max_backoff=900.0):
+        self.retry_seconds = retry_seconds
+        self.max_backoff = max_backoff
+        self._sources = {}
+        self._loaded = {}
+        self._snapshot = MarketSnapshot()
+        self._due = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_source(self, name, fetch, interval):
+        """Register a source, due immediately"""
+        with self._lock:
+            self._sources[name] = (fetch, interval)
+            self._loaded[name] = threading.Event()
+            heapq.heappush(self._due, (time.monotonic(), name))
+        self._wake.set()
+
+    def snapshot(self):
+        """The current snapshot; reading it never blocks on a refresh"""
+        return self._snapshot
+
+    def wait_for(self, names, timeout=None):
+        """Block until every named source has finished its first attempt, then return the snapshot"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for name in names:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            self._loaded[name].wait(remaining)
+        return self._snapshot
+
+    def refresh(self, name):
+        """Fetch one source now on the calling thread and publish the result"""
+        fetch, interval = self._sources[name]
+        previous = self._snapshot.entry(name)
+        try:
+            value = fetch()
+        except Exception as e:
+            # Any error counts, not just network ones: an unexpected payload
+            # (a missing key, a null field) must not end the scheduler thread
+            failures = (previous.failures if previous else 0) + 1
+            delay = min(self.retry_seconds * 2 ** (failures - 1), self.max_backoff) * random.uniform(0.8, 1.2)
+            entry = SourceEntry(
+                previous.value if previous else None,
+                previous.updated if previous else None,
+                f"{type(e).__name__}: {e}",
+                failures,
+                time.time() + delay
+            )
+        else:
+            delay = interval
+            entry = SourceEntry(value, time.time(), None, 0, time.time() + delay)
+
+        try:
+            with self._lock:
+                self._snapshot = self._snapshot.with_entry(name, entry)
+        finally:
+            # Even if publishing fails, first-load waiters must not block for their whole timeout
+            self._loaded[name].set()
+        return delay
+
+    def start(self):
+        """Start the scheduler thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="market-refresh", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Cleared before looking, so a source added meanwhile still wakes the wait below
+            self._wake.clear()
+            with self._lock:
+                due_at, name = self._due[0] if self._due else (None, None)
+            if name is None or due_at > time.monotonic():
+                self._wake.wait(None if due_at is None else due_at - time.monotonic())
+                continue
+            with self._lock:
+                heapq.heappop(self._due)
+            delay = self.refresh(name)
+            with self._lock:
+                heapq.heappush(self._due, (time.monotonic() + delay, name))
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
@@ -0,0 +1,22 @@
+import numpy as np
+
+
+def simulate_price_paths(start_prices, drifts, volatilities, days, seed=42):
+    """Simulate daily closes for several tickers as one batched geometric random walk
+
+    Returns a (days, tickers) array whose first row is the start prices.
+    """
+    start_prices = np.asarray(start_prices, dtype=float)
+    drifts = np.asarray(drifts, dtype=float)
+    volatilities = np.asarray(volatilities, dtype=float)
+
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((days - 1, start_prices.size))
+
+    # Daily log-returns, drift-corrected so the expected simple return matches the drift
+    log_returns = (drifts - 0.5 * volatilities ** 2) + volatilities * shocks
+
+    log_paths = np.empty((days, start_prices.size))
+    log_paths[0] = 0.0
+    np.cumsum(log_returns, axis=0, out=log_paths[1:])
+    return start_prices * np.exp(log_paths)
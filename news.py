@@ -0,0 +1,333 @@
+import datetime
+import email.utils
+import glob
+import html
+import json
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from xml.etree import ElementTree
+
+import numpy as np
+
+# Words that make a story more relevant to students
+STUDENT_KEYWORDS = {
+    "student", "students", "college", "loan", "loans", "tuition", "savings", "budget", "budgeting",
+    "credit", "interest", "rates", "debt", "scholarship", "internship", "fafsa", "index"
+}
+
+FEED_EXTENSIONS = (".xml", ".rss", ".atom")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+# MinHash permutations are (a * x + b) mod p over 32-bit shingle hashes; a < 2**31
+# keeps a * x + b inside uint64
+_PRIME = np.uint64(4294967311)
+
+
+def _local_name(tag):
+    """Strip the XML namespace from an element tag"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _clean_text(value):
+    """Plain text from a feed field that may contain escaped HTML"""
+    return " ".join(html.unescape(_TAG_RE.sub(" ", value or "")).split())
+
+
+def _parse_timestamp(value):
+    """Parse an RSS (RFC 822) or Atom (ISO 8601) date into a Unix timestamp, or None"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+def iter_feed_items(source):
+    """Yield one dict per RSS <item> or Atom <entry>, parsing the document incrementally
+
+    source is a path or binary file object. Each item element is cleared once
+    read, so memory stays flat however long the feed is.
+    """
+    for _, element in ElementTree.iterparse(source, events=("end",)):
+        if _local_name(element.tag) not in ("item", "entry"):
+            continue
+
+        fields = {}
+        link = None
+        for child in element:
+            name = _local_name(child.tag)
+            if name == "link":
+                # RSS puts the URL in the text, Atom in href (prefer rel="alternate")
+                if link is None or child.get("rel", "alternate") == "alternate":
+                    link = child.get("href") or (child.text or "").strip()
+            else:
+                fields.setdefault(name, child.text)
+
+        title = _clean_text(fields.get("title"))
+        yield {
+            "id": (fields.get("guid") or fields.get("id") or link or title).strip(),
+            "title": title,
+            "link": link,
+            "summary": _clean_text(fields.get("description") or fields.get("summary") or fields.get("content")),
+            "published": _parse_timestamp(fields.get("pubDate") or fields.get("published") or fields.get("updated"))
+        }
+        element.clear()
+
+
+class MinHasher:
+    """MinHash signatures over word shingles, for estimating Jaccard similarity"""
+
+    def __init__(self, num_perm=64, shingle_size=3, seed=1):
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 31, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        words = _WORD_RE.findall(text.lower())
+        size = self.shingle_size
+        shingles = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((hashes[:, None] * self._a + self._b) % _PRIME).min(axis=0)
+
+
+def estimate_similarity(signature, other):
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return float(np.mean(signature == other))
+
+
+class NewsStore:
+    """Small ranked list of stories shared by every session
+
+    Readers get an immutable snapshot; the ingestor swaps in a new one, so a
+    page rerun never waits on ingestion.
+    """
+
+    def __init__(self):
+        self._stories = ()
+
+    def top(self, n=None):
+        return self._stories[:n]
+
+    def replace(self, stories):
+        self._stories = tuple(stories)
+
+    def __len__(self):
+        return len(self._stories)
+
+
+class NewsIngestor:
+    """Pulls feeds into a NewsStore on a background thread
+
+    Only items newer than each feed's high-water mark are processed. Each new
+    item's MinHash signature is looked up in banded LSH buckets, and a near
+    duplicate of a known story is folded into it (raising its source count)
+    instead of being listed again. Marks and the clustered stories are saved
+    to state_path, with recently seen item ids, so a restart neither
+    reprocesses nor forgets them.
+    """
+
+    def __init__(self, store, feeds=(), feed_dir=None, state_path=None, interval=300, store_size=20,
+                 index_size=500, num_perm=64, bands=16, shingle_size=3, duplicate_threshold=0.6,
+                 decay_days=3.0, timeout=10):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.store = store
+        self.feeds = list(feeds)
+        self.feed_dir = feed_dir
+        self.state_path = state_path
+        self.interval = interval
+        self.store_size = store_size
+        self.index_size = index_size
+        self.bands = bands
+        self.duplicate_threshold = duplicate_threshold
+        self.decay_days = decay_days
+        self.timeout = timeout
+        self.errors = {}
+
+        self._hasher = MinHasher(num_perm, shingle_size)
+        self._marks = {}
+        self._stories = {}
+        self._signatures = {}
+        self._buckets = {}
+        # Recently seen item ids, so undated items aren't taken as new on every
+        # poll; saved with the state so a restart doesn't take them as new either
+        self._seen = OrderedDict()
+        self._stop = threading.Event()
+        self._thread = None
+        self._load_state()
+
+    def sources(self):
+        """Feed URLs plus feed files in feed_dir"""
+        sources = list(self.feeds)
+        if self.feed_dir:
+            sources.extend(sorted(
+                path for path in glob.glob(os.path.join(self.feed_dir, "*"))
+                if path.endswith(FEED_EXTENSIONS)
+            ))
+        return sources
+
+    def _open(self, source):
+        if source.startswith(("http://", "https://")):
+            import requests
+
+            response = requests.get(source, stream=True, timeout=self.timeout)
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return response.raw
+        return open(source, "rb")
+
+    def ingest_once(self):
+        """Process new items from every source and publish the re-ranked store; returns items added"""
+        import requests
+
+        added = 0
+        for source in self.sources():
+            feed = os.path.basename(source) if not source.startswith(("http://", "https://")) else source
+            mark, mark_ids = self._marks.get(feed, (0.0, []))
+            newest, newest_ids = mark, set(mark_ids)
+            try:
+                with self._open(source) as stream:
+                    for item in iter_feed_items(stream):
+                        published = item["published"]
+                        if published is not None and (
+                                published < mark or (published == mark and item["id"] in mark_ids)):
+                            continue
+                        # Undated items always look new; skip any already ingested or listed
+                        if item["id"] in self._seen or item["id"] in self._stories:
+                            continue
+                        self._seen[item["id"]] = None
+                        if len(self._seen) > 10 * self.index_size:
+                            self._seen.popitem(last=False)
+                        # Rank an undated item as published now, but keep that time out of
+                        # the mark so it can't hide dated items that arrive late
+                        item["published"] = published or time.time()
+                        item["feed"] = feed
+                        self._add(item)
+                        added += 1
+                        if published is None:
+                            continue
+                        if published > newest:
+                            newest, newest_ids = published, {item["id"]}
+                        elif published == newest:
+                            newest_ids.add(item["id"])
+            except (OSError, ElementTree.ParseError, requests.RequestException) as e:
+                self.errors[feed] = str(e)
+                continue
+            self.errors.pop(feed, None)
+            self._marks[feed] = (newest, sorted(newest_ids))
+
+        ranked = self._rank()
+        self._trim(ranked)
+        self.store.replace(dict(story) for story in ranked[:self.store_size])
+        if added:
+            self._save_state()
+        return added
+
+    def _band_keys(self, signature):
+        rows = len(signature) // self.bands
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+    def _add(self, item):
+        signature = self._hasher.signature(f"{item['title']} {item['summary']}")
+        keys = self._band_keys(signature)
+
+        candidates = {story_id for key in keys for story_id in self._buckets.get(key, ())}
+        best = max(candidates, key=lambda story_id: estimate_similarity(signature, self._signatures[story_id]),
+                   default=None)
+        if best is not None and estimate_similarity(signature, self._signatures[best]) >= self.duplicate_threshold:
+            story = self._stories[best]
+            story["sources"] += 1
+            story["published"] = max(story["published"], item["published"])
+            return
+
+        story_id = item["id"]
+        if story_id in self._stories:
+            return
+        self._stories[story_id] = dict(item, sources=1)
+        self._signatures[story_id] = signature
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(story_id)
+
+    def _score(self, story, now):
+        words = set(_WORD_RE.findall(f"{story['title']} {story['summary']}".lower()))
+        relevance = min(3, len(words & STUDENT_KEYWORDS))
+        age_days = max(0.0, now - story["published"]) / 86400
+        return 2 * math.log2(story["sources"]) + relevance - age_days / self.decay_days
+
+    def _rank(self):
+        now = time.time()
+        return sorted(self._stories.values(), key=lambda story: self._score(story, now), reverse=True)
+
+    def _trim(self, ranked):
+        """Forget the lowest-ranked stories beyond index_size"""
+        for story in ranked[self.index_size:]:
+            story_id = story["id"]
+            del self._stories[story_id]
+            for key in self._band_keys(self._signatures.pop(story_id)):
+                bucket = self._buckets[key]
+                bucket.discard(story_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (TypeError, OSError, ValueError):
+            # No state path, first run or unreadable state: start from scratch
+            return
+        self._marks = {feed: (mark, ids) for feed, (mark, ids) in state.get("marks", {}).items()}
+        self._seen = OrderedDict.fromkeys(state.get("seen", []))
+        for story in state.get("stories", []):
+            sources = story.pop("sources", 1)
+            self._add(story)
+            if story["id"] in self._stories:
+                self._stories[story["id"]]["sources"] = sources
+        self.store.replace(dict(story) for story in self._rank()[:self.store_size])
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"marks": self._marks, "seen": list(self._seen), "stories": list(self._stories.values())}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def start(self):
+        """Ingest now and then every interval seconds on a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="news-ingest", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.ingest_once()
+            except Exception as e:
+                # Per-feed errors are handled in ingest_once; this keeps anything else
+                # (saving state, a malformed item) from ending ingestion for good
+                self.errors["ingest"] = f"{type(e).__name__}: {e}"
+            else:
+                self.errors.pop("ingest", None)
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
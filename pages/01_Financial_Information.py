@@ -1,6 +1,7 @@
+import concurrent.futures
 import streamlit as st
-from utils import load_css, display_sidebar, get_financial_term_content
-from config import POPULAR_TERMS
+from utils import load_css, display_sidebar, get_financial_term_content, is_generated_term, stream_term_text, get_llm_executor, get_related_terms, prefetch_related_terms, search_terms, timed_section, time_page_run
+from config import POPULAR_TERMS, LLM_CONFIG
 
 # Configure page
 st.set_page_config(
@@ -10,6 +11,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Time this run of the page
+time_page_run("financial_information")
+
 # Load custom CSS
 load_css()
 
@@ -25,8 +29,97 @@ Financial terms can be confusing when you're just starting out. FLex makes them
 with explanations specifically designed for students and beginners.
 """)
 
+def select_term(term):
+    """Show a term in the results area"""
+    st.session_state.last_term = term
+    st.session_state.pop('search_matches', None)
+
+def search_term():
+    """Show the catalog term the search box names, keeping other likely terms as suggestions"""
+    query = st.session_state.term_query
+    if query:
+        term, suggestions = search_terms(query)
+        # Queries that name no catalog term still get generated or placeholder content
+        select_term(term or query)
+        st.session_state.search_matches = suggestions
+
+@st.fragment
+def render_term_results():
+    """Render the selected term; related-term clicks rerun only this section"""
+    with timed_section("financial_information.term_results"):
+        term = st.session_state.last_term
+        
+        st.markdown(f"### {term.title()}")
+        
+        if is_generated_term(term):
+            # Only generated terms touch the network, so only they need requests' exceptions
+            import requests
+            
+            # Start the examples now so they generate while the explanation streams in;
+            # the iterator is created here, on the script thread, and only consumed on the worker
+            examples = stream_term_text(term, "examples")
+            examples_future = get_llm_executor().submit(lambda: "".join(examples))
+            related_terms = get_related_terms(term)
+            
+            # Simple explanation tab, rendered token by token
+            with st.expander("Simple Explanation", expanded=True):
+                explanation = st.empty()
+                text = ""
+                try:
+                    for chunk in stream_term_text(term, "content"):
+                        text += chunk
+                        explanation.markdown(f"<div class='highlight'>{text}</div>", unsafe_allow_html=True)
+                except requests.RequestException:
+                    explanation.warning("We couldn't generate an explanation right now. Please try again shortly.")
+            
+            # Examples tab
+            with st.expander("Real-world Examples"):
+                try:
+                    st.markdown(examples_future.result(timeout=LLM_CONFIG["timeout"]))
+                except (requests.RequestException, concurrent.futures.TimeoutError):
+                    st.warning("We couldn't generate examples right now. Please try again shortly.")
+        else:
+            # Get content for the selected term
+            term_data = get_financial_term_content(term)
+            related_terms = get_related_terms(term)
+            
+            # Simple explanation tab
+            with st.expander("Simple Explanation", expanded=True):
+                st.markdown(f"<div class='highlight'>{term_data['content']}</div>", unsafe_allow_html=True)
+            
+            # Examples tab
+            with st.expander("Real-world Examples"):
+                st.markdown(term_data['examples'])
+        
+        # Learn more tab
+        with st.expander("Learn More"):
+            st.write("Additional resources and links would appear here.")
+        
+        # Related terms
+        if related_terms:
+            st.markdown("### Related Terms")
+            related_cols = st.columns(len(related_terms))
+            for i, rel_term in enumerate(related_terms):
+                # Clicking reruns only this fragment, after select_term has run
+                related_cols[i].button(rel_term, key=f"related_{i}", on_click=select_term, args=(rel_term,))
+            
+            # Generate the likely next clicks while this term is being read
+            prefetch_related_terms(related_terms)
+
 # Search bar for financial terms
-term_query = st.text_input("Search for a financial term or concept:", placeholder="e.g., compound interest, ETF, 401k")
+st.text_input(
+    "Search for a financial term or concept:",
+    placeholder="e.g., compound interest, ETF, 401k",
+    key="term_query",
+    on_change=search_term
+)
+
+# Other catalog matches for the last search
+if st.session_state.get('search_matches'):
+    st.markdown("Other matches:")
+    match_cols = st.columns(len(st.session_state.search_matches))
+    for i, match in enumerate(st.session_state.search_matches):
+        match_cols[i].button(match, key=f"match_{i}", on_click=select_term, args=(match,))
 
 # Quick access buttons for common terms
 st.markdown("### Popular Topics:")
@@ -34,38 +127,11 @@ cols = st.columns(4)
 
 for i, term in enumerate(POPULAR_TERMS):
     col_idx = i % 4
-    if cols[col_idx].button(term, key=f"term_{i}"):
-        term_query = term
+    cols[col_idx].button(term, key=f"term_{i}", on_click=select_term, args=(term,))
 
 # Results area (shows up when a search is performed)
-if term_query or 'last_term' in st.session_state:
-    term = term_query if term_query else st.session_state.last_term
-    st.session_state.last_term = term
-    
-    st.markdown(f"### {term.title()}")
-    
-    # Get content for the selected term
-    term_data = get_financial_term_content(term)
-    
-    # Simple explanation tab
-    with st.expander("Simple Explanation", expanded=True):
-        st.markdown(f"<div class='highlight'>{term_data['content']}</div>", unsafe_allow_html=True)
-    
-    # Examples tab
-    with st.expander("Real-world Examples"):
-        st.markdown(term_data['examples'])
-    
-    # Learn more tab
-    with st.expander("Learn More"):
-        st.write("Additional resources and links would appear here.")
-    
-    # Related terms
-    st.markdown("### Related Terms")
-    related_cols = st.columns(len(term_data['related']))
-    for i, rel_term in enumerate(term_data['related']):
-        if related_cols[i].button(rel_term, key=f"related_{i}"):
-            st.session_state.last_term = rel_term
-            st.experimental_rerun()
+if 'last_term' in st.session_state:
+    render_term_results()
 
 # Footer
-st.markdown("<div class='footer'>FLex - Financial Literacy Assistant for Students<br>Educational purposes only. Not financial advice.</div>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<div class='footer'>FLex - Financial Literacy Assistant for Students<br>Educational purposes only. Not financial advice.</div>", unsafe_allow_html=True)
@@ -1,8 +1,9 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
-from utils import load_css, display_sidebar, calculate_financial_score, get_savings_allocation
-from config import PROFILE_OPTIONS
+from utils import load_css, display_sidebar, calculate_financial_score, get_savings_allocation, get_savings_projection, score_cohort_csv, save_profile, forget_profile, build_figure, span, timed_section, time_page_run
+from config import PROFILE_OPTIONS, BRACKET_AMOUNTS, PROJECTION_CONFIG
+from student_profile import StudentProfile
 
 # Configure page
 st.set_page_config(
@@ -12,6 +13,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Time this run of the page
+time_page_run("know_your_finances")
+
 # Load custom CSS
 load_css()
 
@@ -21,179 +25,260 @@ display_sidebar()
 # Page header
 st.markdown("<div class='main-header'>Know Your Finances</div>", unsafe_allow_html=True)
 
-# Check if profile exists or edit requested
-if 'profile_complete' not in st.session_state or st.session_state.get('edit_profile', False):
-    if 'edit_profile' in st.session_state:
-        del st.session_state.edit_profile
-        
-    st.info("Let's get to know your financial situation to provide personalized guidance.")
-    
-    # Financial profile form
-    with st.form("financial_profile"):
-        st.write("### Basic Information")
-        name = st.text_input("Name", value=st.session_state.get('user_name', ''))
-        age = st.number_input("Age", min_value=16, max_value=100, value=st.session_state.get('user_age', 20))
-        
-        status_options = PROFILE_OPTIONS["status"]
-        status = st.selectbox("Status", 
-                             status_options,
-                             index=status_options.index(st.session_state.get('user_status', "Undergraduate")) if st.session_state.get('user_status') in status_options else 0)
-        
-        st.write("### Financial Snapshot")
-        income_options = PROFILE_OPTIONS["income"]
-        income = st.selectbox("Monthly Income", 
-                             income_options,
-                             index=income_options.index(st.session_state.get('user_income', "$0-500")) if st.session_state.get('user_income') in income_options else 0)
-        
-        savings_options = PROFILE_OPTIONS["savings"]
-        savings = st.selectbox("Current Savings", 
-                              savings_options,
-                              index=savings_options.index(st.session_state.get('user_savings', "$0-100")) if st.session_state.get('user_savings') in savings_options else 0)
-        
-        debt_options = PROFILE_OPTIONS["debt"]
-        debt = st.selectbox("Current Debt", 
-                           debt_options,
-                           index=debt_options.index(st.session_state.get('user_debt', "None")) if st.session_state.get('user_debt') in debt_options else 0)
-        
-        st.write("### Financial Goals")
-        goals = st.multiselect(
-            "Select your top financial goals",
-            PROFILE_OPTIONS["goals"],
-            default=st.session_state.get('user_goals', ["Emergency Fund"])
-        )
-        
-        submitted = st.form_submit_button("Save My Profile")
-        if submitted:
-            st.session_state.user_name = name
-            st.session_state.user_age = age
-            st.session_state.user_status = status
-            st.session_state.user_income = income
-            st.session_state.user_savings = savings
-            st.session_state.user_debt = debt
-            st.session_state.user_goals = goals
-            st.session_state.profile_complete = True
-            st.success("Profile saved! Refreshing with your personalized insights...")
-            st.experimental_rerun()
+def start_editing():
+    """Switch the profile section to the edit form"""
+    st.session_state.edit_profile = True
 
-# If profile is complete, show personalized recommendations
-else:
-    st.markdown(f"### Hello, {st.session_state.user_name}!")
-    st.markdown("<div class='highlight'>Based on your profile, here are your personalized recommendations:</div>", unsafe_allow_html=True)
-    
-    # Financial health overview
-    st.markdown("### Your Financial Health")
-    
-    # Calculate financial health score
-    financial_score = calculate_financial_score()
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Financial health visualization
-        st.markdown(f"Financial Health Score: {financial_score}/100")
-        st.progress(financial_score/100)
-        
-        # Score interpretation
-        if financial_score < 40:
-            st.warning("You're at the beginning of your financial journey. Focus on building stability.")
-        elif financial_score < 70:
-            st.info("You're on the right track. Continue building your financial foundation.")
-        else:
-            st.success("You're doing well! Focus on growth and future planning.")
-    
-    with col2:
-        st.markdown("#### Action Items:")
-        
-        # Personalized action items based on profile
-        action_items = []
-        
-        # Check savings
-        if st.session_state.user_savings in ["$0-100", "$101-500"]:
-            action_items.append("• Build emergency fund of at least $1,000")
-        
-        # Check debt
-        if st.session_state.user_debt not in ["None", "Less than $1000"]:
-            action_items.append("• Focus on paying down high-interest debt")
-        
-        # Check income vs savings
-        if st.session_state.user_income in ["$1001-2000", "$2001-3000", "$3000+"] and st.session_state.user_savings in ["$0-100", "$101-500"]:
-            action_items.append("• Increase savings rate to at least 15% of income")
-        
-        # If doing well, suggest investing
-        if financial_score > 60:
-            action_items.append("• Consider starting with low-risk investments")
-        
-        # If no specific actions generated, provide default
-        if not action_items:
-            action_items = ["• Continue current financial habits", "• Review your budget monthly", "• Consider learning about investing"]
-        
-        # Display action items
-        st.markdown("\n".join(action_items))
-    
-    # Recommendations section
-    st.markdown("### Personalized Recommendations")
-    
-    tab1, tab2 = st.tabs(["Savings Strategy", "Investment Options"])
-    
-    with tab1:
-        # Different savings strategies based on user situation
-        if st.session_state.user_debt in ["$5001-25000", "$25000+"]:
-            st.markdown("Based on your current debt level, we recommend a debt-focused savings strategy:")
-            st.markdown("• 50% for Essentials\n• 20% for Debt Repayment\n• 20% for Emergency Fund\n• 10% for Flexible Spending")
-        elif st.session_state.user_income in ["$0-500", "$501-1000"]:
-            st.markdown("With your current income level, focus on a simplified savings approach:")
-            st.markdown("• 60% for Essentials\n• 20% for Emergency Fund\n• 20% for Education & Flexible Spending")
-        else:
-            st.markdown("Based on your profile, we recommend a balanced savings strategy:")
-            st.markdown("• 50% for Essentials\n• 30% for Financial Goals\n• 20% for Flexible Spending")
-        
-        # Get savings allocation data
-        savings_data = get_savings_allocation(st.session_state.user_debt, st.session_state.user_income)
-        
-        # Pie chart for savings allocation
-        fig = px.pie(
-            savings_data, 
-            values='Percentage', 
-            names='Category', 
-            title="Recommended Budget Allocation",
-            color_discrete_sequence=px.colors.sequential.Blues
-        )
-        st.plotly_chart(fig)
-        
-    with tab2:
-        st.markdown("When you're ready to invest, consider these options based on your profile:")
+def reset_profile():
+    """Clear the profile from this session and the profile store"""
+    for key in ['student_profile', 'edit_profile']:
+        if key in st.session_state:
+            del st.session_state[key]
+    forget_profile()
+
+@st.fragment
+def render_profile_section():
+    """Render the profile form or recommendations; widget clicks rerun only this section"""
+    with timed_section("know_your_finances.profile"):
+        profile = st.session_state.get('student_profile')
         
-        # Different investment recommendations based on profile
-        if financial_score < 50:
-            st.markdown("Before investing, focus on building a solid financial foundation:")
-            st.markdown("• High-yield savings account for emergency fund\n• Pay down high-interest debt first\n• Learn about investment basics while saving")
+        # Check if profile exists or edit requested
+        if profile is None or st.session_state.get('edit_profile', False):
+            st.info("Let's get to know your financial situation to provide personalized guidance.")
+            
+            # Prefill the form from the current profile, or the defaults for a new one
+            current = profile or StudentProfile()
+            
+            # Financial profile form
+            with st.form("financial_profile"):
+                st.write("### Basic Information")
+                name = st.text_input("Name", value=current.name)
+                age = st.number_input("Age", min_value=16, max_value=100, value=current.age)
+                
+                status = st.selectbox("Status", PROFILE_OPTIONS["status"], index=current.status)
+                
+                st.write("### Financial Snapshot")
+                income = st.selectbox("Monthly Income", PROFILE_OPTIONS["income"], index=current.income)
+                savings = st.selectbox("Current Savings", PROFILE_OPTIONS["savings"], index=current.savings)
+                debt = st.selectbox("Current Debt", PROFILE_OPTIONS["debt"], index=current.debt)
+                
+                st.write("### Financial Goals")
+                goals = st.multiselect(
+                    "Select your top financial goals",
+                    PROFILE_OPTIONS["goals"],
+                    default=current.goal_labels()
+                )
+                
+                submitted = st.form_submit_button("Save My Profile")
+                if submitted:
+                    st.session_state.student_profile = StudentProfile.from_labels(
+                        name, age, status, income, savings, debt, goals
+                    )
+                    st.session_state.pop('edit_profile', None)
+                    save_profile()
+                    st.success("Profile saved! Refreshing with your personalized insights...")
+                    # Full rerun so the sidebar picks up the new profile
+                    st.rerun()
+
+        # If profile is complete, show personalized recommendations
         else:
-            st.markdown("Based on your profile, consider these beginner-friendly investments:")
-            st.markdown("• Low-cost index funds (S&P 500 index funds)\n• Target-date retirement funds\n• Education-focused accounts (529 plans)")
+            st.markdown(f"### Hello, {profile.name}!")
+            st.markdown("<div class='highlight'>Based on your profile, here are your personalized recommendations:</div>", unsafe_allow_html=True)
             
-            # Simple investment comparison
-            investment_data = pd.DataFrame({
-                'Option': ['High-Yield Savings', 'Index Funds', 'Target-Date Funds'],
-                'Risk Level': ['Very Low', 'Moderate', 'Moderate'],
-                'Potential Return': ['1-2%', '7-10%', '6-9%'],
-                'Minimum Investment': ['$0', '$0-100', '$0-1000'],
-                'Best For': ['Emergency Fund', 'Long-term Growth', 'Retirement']
-            })
+            # Financial health overview
+            st.markdown("### Your Financial Health")
             
-            st.dataframe(investment_data, hide_index=True)
-    
-    # Profile options
-    with st.expander("Profile Options"):
-        if st.button("Edit Profile"):
-            st.session_state.edit_profile = True
-            st.experimental_rerun()
-        
-        if st.button("Reset Profile (Demo)"):
-            for key in ['profile_complete', 'user_name', 'user_age', 'user_status', 
-                        'user_income', 'user_savings', 'user_debt', 'user_goals', 'edit_profile']:
-                if key in st.session_state:
-                    del st.session_state[key]
-            st.experimental_rerun()
+            # Calculate financial health score
+            financial_score = calculate_financial_score(profile)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Financial health visualization
+                st.markdown(f"Financial Health Score: {financial_score}/100")
+                st.progress(financial_score/100)
+                
+                # Score interpretation
+                if financial_score < 40:
+                    st.warning("You're at the beginning of your financial journey. Focus on building stability.")
+                elif financial_score < 70:
+                    st.info("You're on the right track. Continue building your financial foundation.")
+                else:
+                    st.success("You're doing well! Focus on growth and future planning.")
+            
+            with col2:
+                st.markdown("#### Action Items:")
+                
+                # Personalized action items based on profile
+                action_items = []
+                
+                # Check savings
+                if profile.low_savings:
+                    action_items.append("• Build emergency fund of at least $1,000")
+                
+                # Check debt
+                if profile.significant_debt:
+                    action_items.append("• Focus on paying down high-interest debt")
+                
+                # Check income vs savings
+                if profile.steady_income and profile.low_savings:
+                    action_items.append("• Increase savings rate to at least 15% of income")
+                
+                # If doing well, suggest investing
+                if financial_score > 60:
+                    action_items.append("• Consider starting with low-risk investments")
+                
+                # If no specific actions generated, provide default
+                if not action_items:
+                    action_items = ["• Continue current financial habits", "• Review your budget monthly", "• Consider learning about investing"]
+                
+                # Display action items
+                st.markdown("\n".join(action_items))
+            
+            # Recommendations section
+            st.markdown("### Personalized Recommendations")
+            
+            tab1, tab2 = st.tabs(["Savings Strategy", "Investment Options"])
+            
+            with tab1:
+                # Get savings allocation data
+                allocation_bucket, savings_data = get_savings_allocation(profile)
+                
+                # Different savings strategies based on user situation
+                if allocation_bucket == "Debt-Focused":
+                    st.markdown("Based on your current debt level, we recommend a debt-focused savings strategy:")
+                    st.markdown("• 50% for Essentials\n• 20% for Debt Repayment\n• 20% for Emergency Fund\n• 10% for Flexible Spending")
+                elif allocation_bucket == "Simplified":
+                    st.markdown("With your current income level, focus on a simplified savings approach:")
+                    st.markdown("• 60% for Essentials\n• 20% for Emergency Fund\n• 20% for Education & Flexible Spending")
+                else:
+                    st.markdown("Based on your profile, we recommend a balanced savings strategy:")
+                    st.markdown("• 50% for Essentials\n• 30% for Financial Goals\n• 20% for Flexible Spending")
+                
+                # Pie chart for savings allocation
+                with span("chart.budget_allocation"):
+                    fig = build_figure(
+                        "pie",
+                        savings_data, 
+                        values='Percentage', 
+                        names='Category', 
+                        title="Recommended Budget Allocation",
+                        color_discrete_sequence=px.colors.sequential.Blues
+                    )
+                st.plotly_chart(fig)
+                
+            with tab2:
+                st.markdown("When you're ready to invest, consider these options based on your profile:")
+                
+                # Different investment recommendations based on profile
+                if financial_score < 50:
+                    st.markdown("Before investing, focus on building a solid financial foundation:")
+                    st.markdown("• High-yield savings account for emergency fund\n• Pay down high-interest debt first\n• Learn about investment basics while saving")
+                else:
+                    st.markdown("Based on your profile, consider these beginner-friendly investments:")
+                    st.markdown("• Low-cost index funds (S&P 500 index funds)\n• Target-date retirement funds\n• Education-focused accounts (529 plans)")
+                    
+                    # Simple investment comparison
+                    investment_data = pd.DataFrame({
+                        'Option': ['High-Yield Savings', 'Index Funds', 'Target-Date Funds'],
+                        'Risk Level': ['Very Low', 'Moderate', 'Moderate'],
+                        'Potential Return': ['1-2%', '7-10%', '6-9%'],
+                        'Minimum Investment': ['$0', '$0-100', '$0-1000'],
+                        'Best For': ['Emergency Fund', 'Long-term Growth', 'Retirement']
+                    })
+                    
+                    st.dataframe(investment_data, hide_index=True)
+                
+                # Simulated growth of the student's savings under each option
+                years = PROJECTION_CONFIG["years"]
+                monthly_contribution = BRACKET_AMOUNTS["income"][profile.income] * PROJECTION_CONFIG["contribution_rate"]
+                st.markdown(f"#### Where Your Savings Could Be in {years} Years")
+                st.markdown(
+                    f"Starting from about ${BRACKET_AMOUNTS['savings'][profile.savings]:,} and adding "
+                    f"${monthly_contribution:,.0f} a month ({PROJECTION_CONFIG['contribution_rate']:.0%} of your income), "
+                    f"across {PROJECTION_CONFIG['paths']:,} simulated market paths:"
+                )
+                
+                projection = get_savings_projection(profile.savings, profile.income)
+                
+                with span("chart.savings_projection"):
+                    fig = build_figure(
+                        "line",
+                        projection,
+                        x='Year',
+                        y=['P10', 'P25', 'P50', 'P75', 'P90'],
+                        facet_col='Option',
+                        title="Projected Balance (10th to 90th percentile)",
+                        labels={'value': 'Balance ($)', 'variable': 'Percentile'},
+                        color_discrete_sequence=['#BFDBFE', '#60A5FA', '#1D4ED8', '#60A5FA', '#BFDBFE']
+                    )
+                st.plotly_chart(fig)
+                
+                final_year = projection[projection['Year'] == years]
+                st.dataframe(
+                    final_year[['Option', 'P10', 'P50', 'P90']].rename(columns={
+                        'P10': 'Unlucky (10th pct.)', 'P50': 'Typical (median)', 'P90': 'Lucky (90th pct.)'
+                    }).round(0),
+                    hide_index=True
+                )
+                st.caption("Simulated from assumed average returns and volatility for each option. Real returns will differ.")
+            
+            # Profile options
+            with st.expander("Profile Options"):
+                # Editing only swaps this section to the form, so it reruns just this fragment
+                st.button("Edit Profile", key="edit_profile_button", on_click=start_editing)
+                
+                if st.button("Reset Profile (Demo)", key="reset_profile_button"):
+                    reset_profile()
+                    # Full rerun so the sidebar forgets the profile too
+                    st.rerun()
+
+@st.fragment
+def render_cohort_tools():
+    """Render the advisor cohort scoring tools as an independently rerunnable section"""
+    with timed_section("know_your_finances.cohort_tools"):
+        # Cohort scoring for advisors
+        with st.expander("Advisor Tools: Score a Student Cohort"):
+            st.markdown("Upload a CSV with `savings`, `debt` and `income` columns using the same brackets as the profile form.")
+            cohort_file = st.file_uploader("Cohort CSV", type="csv", key="cohort_csv")
+            
+            if cohort_file is not None:
+                try:
+                    scored_cohort, score_counts = score_cohort_csv(cohort_file.getvalue())
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    stat_col1, stat_col2, stat_col3 = st.columns(3)
+                    stat_col1.metric("Students", f"{len(scored_cohort):,}")
+                    stat_col2.metric("Median Score", f"{scored_cohort['Score'].median():.0f}")
+                    stat_col3.metric("Average Score", f"{scored_cohort['Score'].mean():.1f}")
+                    
+                    with span("chart.cohort_scores"):
+                        fig = build_figure(
+                            "bar",
+                            score_counts,
+                            x='Score Range',
+                            y='Students',
+                            title="Financial Health Score Distribution",
+                            color_discrete_sequence=['#3B82F6']
+                        )
+                    st.plotly_chart(fig)
+                    
+                    st.markdown("#### Recommended Allocation Buckets")
+                    st.dataframe(
+                        scored_cohort['Allocation'].value_counts().rename_axis('Allocation').reset_index(name='Students'),
+                        hide_index=True
+                    )
+                    
+                    st.download_button(
+                        "Download Scored Cohort",
+                        scored_cohort.to_csv(index=False),
+                        file_name="scored_cohort.csv",
+                        mime="text/csv"
+                    )
+
+render_profile_section()
+render_cohort_tools()
 
 # Footer
-st.markdown("<div class='footer'>FLex - Financial Literacy Assistant for Students<br>Educational purposes only. Not financial advice.</div>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<div class='footer'>FLex - Financial Literacy Assistant for Students<br>Educational purposes only. Not financial advice.</div>", unsafe_allow_html=True)
@@ -1,7 +1,7 @@
 import streamlit as st
 import datetime
-import plotly.express as px
-from utils import load_css, display_sidebar, generate_market_data, get_bank_data, get_loan_data
+from utils import load_css, display_sidebar, get_price_history, get_index_metrics, get_bank_index, get_news_store, get_loan_data, get_loan_scenarios, get_loan_balance_schedules, get_quote_table, describe_market_freshness, build_figure, span, time_page_run
+from config import MARKET_TICKERS, HISTORY_RANGES, CHART_CONFIG, BANK_CATALOG_CONFIG, NEWS_CONFIG, LOAN_SCENARIOS
 
 # Configure page
 st.set_page_config(
@@ -11,6 +11,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Time this run of the page
+time_page_run("current_market")
+
 # Load custom CSS
 load_css()
 
@@ -30,6 +33,116 @@ We focus on what's most relevant for beginners and young investors.
 today = datetime.date.today()
 st.markdown(f"### Market Data as of {today.strftime('%B %d, %Y')}")
 
+@st.fragment
+def render_bank_rates():
+    """Render the filtered, paginated bank comparison; filter and page changes rerun only this section"""
+    bank_index = get_bank_index()
+    if bank_index is None:
+        st.caption("Bank rates are unavailable right now.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    rate_column = col1.selectbox("Compare", bank_index.rate_columns, key="bank_rate_column")
+    order = col2.selectbox("Sort", ["Highest rate first", "Lowest rate first"], key="bank_sort")
+    perks_only = col3.checkbox("Student perks only", key="bank_perks_only")
+    
+    # Bar chart for the best rates that match the filters
+    top_banks = bank_index.top_k(rate_column, BANK_CATALOG_CONFIG["chart_top_k"], perks_only=perks_only)
+    with span("chart.bank_rates"):
+        fig = build_figure(
+            "bar",
+            top_banks, 
+            x='Bank', 
+            y=bank_index.rate_columns,
+            barmode='group',
+            title=f"Top {len(top_banks)} by {rate_column} (%)",
+            color_discrete_sequence=['#3B82F6', '#10B981', '#6366F1']
+        )
+    st.plotly_chart(fig)
+    
+    # Bank comparison table, one page at a time
+    st.markdown("### Student Account Comparison")
+    page_size = BANK_CATALOG_CONFIG["page_size"]
+    _, total = bank_index.query(rate_column, perks_only=perks_only, limit=0)
+    page_count = max(1, -(-total // page_size))
+    if st.session_state.get("bank_page", 1) > page_count:
+        st.session_state.bank_page = page_count
+    page = st.number_input("Page", min_value=1, max_value=page_count, key="bank_page") if page_count > 1 else 1
+    
+    bank_page, _ = bank_index.query(
+        rate_column,
+        perks_only=perks_only,
+        ascending=order == "Lowest rate first",
+        offset=(page - 1) * page_size,
+        limit=page_size
+    )
+    st.dataframe(bank_page, hide_index=True)
+    if total:
+        st.caption(f"Showing {(page - 1) * page_size + 1:,}-{(page - 1) * page_size + len(bank_page):,} of {total:,} products. "
+                   f"Rates: {describe_market_freshness('bank_rates')}")
+
+@st.fragment
+def render_loan_what_if():
+    """Render the student loan what-if calculator; slider moves rerun only this section"""
+    st.markdown("#### Student Loan What-If Calculator")
+    st.markdown("See how the loan type, repayment term and paying a little extra each month change what you pay in interest:")
+    
+    col1, col2, col3 = st.columns(3)
+    principal = col1.slider("Amount Borrowed ($)", 1000, 100000, LOAN_SCENARIOS["default_principal"], step=1000, key="loan_principal")
+    term = col2.select_slider("Repayment Term (years)", LOAN_SCENARIOS["terms_years"], value=10, key="loan_term")
+    extra = col3.select_slider("Extra Monthly Payment ($)", LOAN_SCENARIOS["extra_payments"], value=0, key="loan_extra")
+    
+    # Every scenario for this amount is computed in one pass; the sliders just pick slices
+    scenarios = get_loan_scenarios(principal)
+    term_scenarios = scenarios[scenarios['Term (years)'] == term]
+    
+    with span("chart.loan_what_if"):
+        fig = build_figure(
+            "line",
+            term_scenarios,
+            x='Extra Payment',
+            y='Total Interest',
+            color='Loan Type',
+            title=f"Total Interest on ${principal:,} Repaid Over {term} Years",
+            labels={'Extra Payment': 'Extra Monthly Payment ($)', 'Total Interest': 'Total Interest ($)'},
+            color_discrete_sequence=['#2563EB', '#10B981', '#6366F1', '#F59E0B']
+        )
+    st.plotly_chart(fig)
+    
+    selected = term_scenarios[term_scenarios['Extra Payment'] == extra]
+    st.dataframe(
+        selected[['Loan Type', 'Monthly Payment', 'Payoff Month', 'Total Interest', 'Interest Saved']],
+        hide_index=True,
+        column_config={
+            'Monthly Payment': st.column_config.NumberColumn(format="$%.2f"),
+            'Payoff Month': st.column_config.NumberColumn("Paid Off After (months)"),
+            'Total Interest': st.column_config.NumberColumn(format="$%.2f"),
+            'Interest Saved': st.column_config.NumberColumn(format="$%.2f")
+        }
+    )
+    st.caption(f"Compared {len(scenarios):,} repayment scenarios across every loan type, term and extra payment.")
+    
+    # Month-by-month balances for the selected term and extra payment
+    schedules = get_loan_balance_schedules(principal, term, extra)
+    with span("chart.loan_balance"):
+        fig = build_figure(
+            "line",
+            schedules,
+            x='Month',
+            y='Balance',
+            color='Loan Type',
+            title=f"Remaining Balance Paying ${extra:,} Extra per Month",
+            labels={'Month': 'Months into Repayment', 'Balance': 'Remaining Balance ($)'},
+            color_discrete_sequence=['#2563EB', '#10B981', '#6366F1', '#F59E0B']
+        )
+    st.plotly_chart(fig)
+
+def format_change(value, signed=True):
+    """Format a fractional return as a percentage, or a dash when there isn't enough history"""
+    if value is None:
+        return "—"
+    return f"{value:+.2%}" if signed else f"{value:.2%}"
+
 # Tabs for different market sections
 market_tab1, market_tab2, market_tab3 = st.tabs(["Bank Rates", "Market Performance", "Student Insights"])
 
@@ -37,23 +150,7 @@ with market_tab1:
     st.markdown("### Bank Interest Rates")
     st.markdown("Compare current interest rates for accounts popular with students:")
     
-    # Get bank data
-    bank_df = get_bank_data()
-    
-    # Bar chart for interest rates
-    fig = px.bar(
-        bank_df, 
-        x='Bank', 
-        y=['Savings Rate', 'CD Rate (1-year)'],
-        barmode='group',
-        title="Current Interest Rates (%)",
-        color_discrete_sequence=['#3B82F6', '#10B981']
-    )
-    st.plotly_chart(fig)
-    
-    # Bank comparison table
-    st.markdown("### Student Account Comparison")
-    st.dataframe(bank_df, hide_index=True)
+    render_bank_rates()
     
     st.info("💡 **Tip:** Online banks often offer higher interest rates because they have lower overhead costs than traditional banks with physical branches.")
 
@@ -61,37 +158,48 @@ with market_tab2:
     # Market indices
     st.markdown("### Market Indices Performance")
     
-    # Generate market data
-    market_data = generate_market_data()
+    # Read the selected range from the local price history store
+    history_range = st.radio("Range", list(HISTORY_RANGES), horizontal=True, key="history_range")
+    market_data = get_price_history(HISTORY_RANGES[history_range])
     
     # Line chart for market performance
-    fig = px.line(
-        market_data, 
-        x='Date', 
-        y=['S&P 500 (SPY)', 'NASDAQ (QQQ)', 'Total Market (VTI)'],
-        title="30-Day Market Performance",
-        labels={'value': 'Price', 'variable': 'Index'},
-        color_discrete_sequence=['#2563EB', '#10B981', '#6366F1']
-    )
+    with span("chart.market_history"):
+        fig = build_figure(
+            "line",
+            market_data, 
+            max_points=CHART_CONFIG["max_points"],
+            x='Date', 
+            y=list(MARKET_TICKERS),
+            title=f"{history_range} Market Performance",
+            labels={'value': 'Price', 'variable': 'Index'},
+            color_discrete_sequence=['#2563EB', '#10B981', '#6366F1']
+        )
     st.plotly_chart(fig)
     
-    # Current metrics
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        last_spy = market_data['S&P 500 (SPY)'].iloc[-1]
-        spy_change = (last_spy - market_data['S&P 500 (SPY)'].iloc[-2]) / market_data['S&P 500 (SPY)'].iloc[-2] * 100
-        st.metric("S&P 500 (SPY)", f"${last_spy:.2f}", f"{spy_change:.2f}%")
-    
-    with col2:
-        last_qqq = market_data['NASDAQ (QQQ)'].iloc[-1]
-        qqq_change = (last_qqq - market_data['NASDAQ (QQQ)'].iloc[-2]) / market_data['NASDAQ (QQQ)'].iloc[-2] * 100
-        st.metric("NASDAQ (QQQ)", f"${last_qqq:.2f}", f"{qqq_change:.2f}%")
+    # Current metrics, precomputed by the market refresher as each new bar lands
+    index_metrics = get_index_metrics()
+    for col, (name, ticker) in zip(st.columns(len(MARKET_TICKERS)), MARKET_TICKERS.items()):
+        metrics = index_metrics.get(ticker["symbol"])
+        if metrics is None:
+            continue
+        with col:
+            daily = metrics["daily_return"]
+            st.metric(name, f"${metrics['close']:.2f}", None if daily is None else format_change(daily))
+            st.caption(
+                f"1W {format_change(metrics['weekly_return'])} • YTD {format_change(metrics['ytd_return'])}  \n"
+                f"52W range ${metrics['low_52w']:,.2f} – ${metrics['high_52w']:,.2f}  \n"
+                f"Volatility {format_change(metrics['volatility'], signed=False)} • "
+                f"Max drawdown {format_change(metrics['max_drawdown'])}"
+            )
     
-    with col3:
-        last_vti = market_data['Total Market (VTI)'].iloc[-1]
-        vti_change = (last_vti - market_data['Total Market (VTI)'].iloc[-2]) / market_data['Total Market (VTI)'].iloc[-2] * 100
-        st.metric("Total Market (VTI)", f"${last_vti:.2f}", f"{vti_change:.2f}%")
+    # Latest quotes, kept fresh for every session by the background market refresher
+    st.markdown("#### Latest Quotes")
+    quote_df = get_quote_table()
+    if quote_df.empty:
+        st.caption("Live quotes are unavailable right now.")
+    else:
+        st.dataframe(quote_df, hide_index=True)
+        st.caption(f"Quotes: {describe_market_freshness('quotes')}")
     
     st.info("💡 **What this means:** These indices track the performance of large groups of stocks. They're often used as benchmarks to measure how well investments are performing.")
 
@@ -104,43 +212,64 @@ with market_tab3:
     # Get loan data
     loan_df = get_loan_data()
     
-    # Bar chart for loan rates
-    fig = px.bar(
-        loan_df,
-        x='Loan Type',
-        y='Interest Rate',
-        title="Student Loan Interest Rates (%)",
-        color_discrete_sequence=['#3B82F6']
-    )
-    st.plotly_chart(fig)
+    if loan_df is None:
+        st.caption("Loan rates are unavailable right now.")
+    else:
+        # Bar chart for loan rates
+        with span("chart.loan_rates"):
+            fig = build_figure(
+                "bar",
+                loan_df,
+                x='Loan Type',
+                y='Interest Rate',
+                title="Student Loan Interest Rates (%)",
+                color_discrete_sequence=['#3B82F6']
+            )
+        st.plotly_chart(fig)
+        st.caption(f"Loan rates: {describe_market_freshness('loan_rates')}")
+        
+        render_loan_what_if()
     
-    # Recent news relevant to students
+    # Recent news relevant to students, ranked by the background news ingestor
     st.markdown("### Beginner-Friendly Market News")
     
-    with st.expander("What Rising Interest Rates Mean for Students", expanded=True):
-        st.markdown("""
-        Interest rates have increased over the past year. Here's what this means for students:
+    stories = get_news_store().top(NEWS_CONFIG["display_items"])
+    for i, story in enumerate(stories):
+        with st.expander(story["title"], expanded=i == 0):
+            st.markdown(story["summary"].replace("$", "\\$"))
+            details = [datetime.datetime.fromtimestamp(story["published"]).strftime('%B %d, %Y')]
+            if story["sources"] > 1:
+                details.append(f"covered by {story['sources']} sources")
+            if story.get("link"):
+                details.append(f"[Read more]({story['link']})")
+            st.caption(" • ".join(details))
+    
+    # Bundled stories until the first ingest has published something
+    if not stories:
+        with st.expander("What Rising Interest Rates Mean for Students", expanded=True):
+            st.markdown("""
+            Interest rates have increased over the past year. Here's what this means for students:
         
-        * **Student Loans**: Variable rate private loans may see payment increases
-        * **Savings Accounts**: Higher interest rates on savings (a good thing!)
-        * **Credit Cards**: Higher interest on unpaid balances - try to pay in full each month
-        * **Job Market**: Can impact hiring in some sectors as companies adjust spending
+            * **Student Loans**: Variable rate private loans may see payment increases
+            * **Savings Accounts**: Higher interest rates on savings (a good thing!)
+            * **Credit Cards**: Higher interest on unpaid balances - try to pay in full each month
+            * **Job Market**: Can impact hiring in some sectors as companies adjust spending
         
-        **Action Item**: Now is a good time to check if your savings account is offering a competitive interest rate.
-        """)
+            **Action Item**: Now is a good time to check if your savings account is offering a competitive interest rate.
+            """)
     
-    with st.expander("Budget Apps Gaining Popularity Among Students"):
-        st.markdown("""
-        Recent surveys show more students are using budgeting apps to track expenses.
+        with st.expander("Budget Apps Gaining Popularity Among Students"):
+            st.markdown("""
+            Recent surveys show more students are using budgeting apps to track expenses.
         
-        Popular free options include:
-        * Mint
-        * EveryDollar
-        * Personal Capital
+            Popular free options include:
+            * Mint
+            * EveryDollar
+            * Personal Capital
         
-        These apps can connect to your accounts and help categorize spending automatically,
-        making it easier to see where your money goes each month.
-        """)
+            These apps can connect to your accounts and help categorize spending automatically,
+            making it easier to see where your money goes each month.
+            """)
 
 # Disclaimer
 st.markdown("---")
@@ -0,0 +1,217 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class TimingLog:
+    """Process-wide record of recent wall-clock and CPU timings per section name"""
+
+    def __init__(self, maxlen=500):
+        self.maxlen = maxlen
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, wall, cpu):
+        with self._lock:
+            timings = self._timings.get(name)
+            if timings is None:
+                timings = self._timings[name] = deque(maxlen=self.maxlen)
+            timings.append((wall, cpu))
+
+    @contextmanager
+    def time(self, name):
+        """Time the enclosed block; CPU time is for the current thread only"""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+    def summary(self):
+        """Return one row per section with run count and median/p95 timings in ms"""
+        with self._lock:
+            snapshot = {name: list(timings) for name, timings in self._timings.items()}
+
+        rows = []
+        for name, timings in sorted(snapshot.items()):
+            wall = sorted(w for w, _ in timings)
+            cpu = sorted(c for _, c in timings)
+            rows.append({
+                "Section": name,
+                "Runs": len(timings),
+                "Median (ms)": round(percentile(wall, 0.5) * 1000, 2),
+                "p95 (ms)": round(percentile(wall, 0.95) * 1000, 2),
+                "Median CPU (ms)": round(percentile(cpu, 0.5) * 1000, 2)
+            })
+        return rows
+
+
+# Histogram bucket upper bounds in seconds, Prometheus-style
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+
+class Histogram:
+    """Fixed-bucket latency histogram"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, fraction):
+        """Upper bound of the bucket holding the given quantile"""
+        target = fraction * self.count
+        running = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            running += count
+            if running >= target and running:
+                return bound
+        return 0.0
+
+
+class SpanRegistry:
+    """Thread-safe set of span histograms keyed by span name"""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def summary(self):
+        """Return one row per span with call count and mean/p50/p95 latency in ms"""
+        with self._lock:
+            return [{
+                "Span": name,
+                "Calls": histogram.count,
+                "Mean (ms)": round(histogram.total / histogram.count * 1000, 2),
+                "p50 ≤ (ms)": histogram.quantile(0.5) * 1000,
+                "p95 ≤ (ms)": histogram.quantile(0.95) * 1000
+            } for name, histogram in sorted(self._histograms.items())]
+
+    def to_prometheus(self, metric="flex_span_seconds"):
+        """Render every histogram in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {metric} Time spent in instrumented FLex code paths.",
+            f"# TYPE {metric} histogram"
+        ]
+        with self._lock:
+            for name, histogram in sorted(self._histograms.items()):
+                running = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    running += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{span="{name}",le="{le}"}} {running}')
+                lines.append(f'{metric}_sum{{span="{name}"}} {histogram.total!r}')
+                lines.append(f'{metric}_count{{span="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+# Instrumentation state, set once by configure() before any timed() decoration
+_enabled = False
+_process_spans = SpanRegistry()
+_session_spans = lambda: None
+_export_path = None
+_export_interval = 15.0
+_next_export = 0.0
+_export_lock = threading.Lock()
+_DISABLED_SPAN = nullcontext()
+
+
+def configure(enabled, export_path=None, export_interval=15.0, session_spans=None):
+    """Turn span instrumentation on or off
+
+    session_spans is a callable returning the current session's SpanRegistry
+    (or None outside a session). Must run before the timed() decorators it
+    should affect are applied, since disabled decorators return the function as-is.
+    """
+    global _enabled, _export_path, _export_interval, _session_spans
+    _enabled = enabled
+    _export_path = export_path
+    _export_interval = export_interval
+    _session_spans = session_spans or (lambda: None)
+
+
+def process_spans():
+    """Get the process-wide span histograms"""
+    return _process_spans
+
+
+def _record(name, seconds):
+    global _next_export
+    _process_spans.observe(name, seconds)
+    session = _session_spans()
+    if session is not None:
+        session.observe(name, seconds)
+
+    # Whichever thread first notices the interval has passed does the export
+    if _export_path is not None and time.monotonic() >= _next_export and _export_lock.acquire(blocking=False):
+        try:
+            _next_export = time.monotonic() + _export_interval
+            export_prometheus(_export_path)
+        finally:
+            _export_lock.release()
+
+
+def export_prometheus(path):
+    """Write the process-wide histograms to a Prometheus text file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(_process_spans.to_prometheus())
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def _span(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - started)
+
+
+def span(name):
+    """Time the enclosed block as a named span (a shared no-op when disabled)"""
+    return _span(name) if _enabled else _DISABLED_SPAN
+
+
+def timed(name):
+    """Decorator timing every call as a named span; a no-op when disabled"""
+    def decorate(func):
+        if not _enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - started)
+        return wrapper
+    return decorate
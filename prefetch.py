@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    """Bounded background pool that warms a shared cache ahead of likely requests
+
+    Jobs are keyed by what they fetch (e.g. a response cache key), so a key is
+    fetched at most once at a time however many sessions ask for it, and are
+    owned by the session that asked, so a session's queued jobs can be
+    cancelled once they stop being likely. At most max_pending jobs are queued
+    or running; past that new jobs are dropped rather than delaying the ones
+    already queued. Finished keys remember how long they took, so a later
+    foreground request that finds one in the cache counts as a hit along with
+    the time it saved.
+    """
+
+    def __init__(self, max_workers=2, max_pending=16, max_tracked=1000):
+        self.max_pending = max_pending
+        self.max_tracked = max_tracked
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.dropped = 0
+        self.hits = 0
+        self.seconds_saved = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._inflight = {}
+        self._owners = {}
+        self._finished = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, owner, key, fetch):
+        """Queue fetch() to warm key on behalf of owner; returns whether it was queued"""
+        with self._lock:
+            if key in self._inflight:
+                return False
+            if len(self._inflight) >= self.max_pending:
+                self.dropped += 1
+                return False
+            # _run can't finish before this registers it, as it needs the lock too
+            self._inflight[key] = (owner, self._executor.submit(self._run, key, fetch))
+            self._owners.setdefault(owner, set()).add(key)
+            self.submitted += 1
+            return True
+
+    def _run(self, key, fetch):
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            fetch()
+            succeeded = True
+        finally:
+            with self._lock:
+                self._forget(key)
+                if succeeded:
+                    self.completed += 1
+                    self._finished[key] = time.perf_counter() - started
+                    if len(self._finished) > self.max_tracked:
+                        self._finished.popitem(last=False)
+                else:
+                    self.failed += 1
+
+    def _forget(self, key):
+        owner, _ = self._inflight.pop(key)
+        keys = self._owners[owner]
+        keys.discard(key)
+        if not keys:
+            del self._owners[owner]
+
+    def cancel(self, owner):
+        """Cancel owner's jobs that haven't started; running ones finish and still warm the cache"""
+        with self._lock:
+            cancelled = 0
+            for key in list(self._owners.get(owner, ())):
+                if self._inflight[key][1].cancel():
+                    self._forget(key)
+                    cancelled += 1
+            self.cancelled += cancelled
+            return cancelled
+
+    def record_use(self, key):
+        """Note a foreground request served from the cache; returns whether a prefetch put it there"""
+        with self._lock:
+            seconds = self._finished.pop(key, None)
+            if seconds is None:
+                return False
+            self.hits += 1
+            self.seconds_saved += seconds
+            return True
+
+    def stats(self):
+        """Return job counters, the share of finished prefetches later used and the time they saved"""
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "dropped": self.dropped,
+                "in_flight": len(self._inflight),
+                "hits": self.hits,
+                "hit_rate": self.hits / self.completed if self.completed else 0.0,
+                "seconds_saved": round(self.seconds_saved, 3)
+            }
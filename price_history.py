@@ -0,0 +1,115 @@
+import datetime
+import os
+import shutil
+import threading
+import zlib
+
+import numpy as np
+
+from market_sim import simulate_price_paths
+
+# One fixed-width record per daily bar, stored back to back in <SYMBOL>.bin
+BAR_DTYPE = np.dtype([("date", "datetime64[D]"), ("close", "<f8")])
+
+
+class PriceHistoryStore:
+    """Append-only on-disk daily price history with memory-mapped reads
+
+    Each ticker is a flat binary file of BAR_DTYPE records in date order.
+    Reads map the file and return views into it, so a date-range slice
+    never copies the underlying history. Appends write a new copy of the
+    file and rename it into place, so a reader only ever maps a complete
+    file and views it already holds stay valid.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._maps = {}
+        self._lock = threading.Lock()
+
+    def _path(self, symbol):
+        return os.path.join(self.root, f"{symbol}.bin")
+
+    def _bars(self, symbol):
+        """Return a read-only memmap over every stored bar for symbol"""
+        path = self._path(symbol)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return np.empty(0, dtype=BAR_DTYPE)
+        if stat.st_size == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        cached = self._maps.get(symbol)
+        if cached is None or cached[0] != stat.st_ino:
+            # Re-map only when an append has replaced the file
+            cached = (stat.st_ino, np.memmap(path, dtype=BAR_DTYPE, mode="r"))
+            self._maps[symbol] = cached
+        return cached[1]
+
+    def last_bar(self, symbol):
+        """Return the most recent stored bar, or None if there is no history"""
+        bars = self._bars(symbol)
+        return bars[-1] if len(bars) else None
+
+    def read(self, symbol, start=None, end=None):
+        """Return the bars with start <= date <= end as a zero-copy view"""
+        bars = self._bars(symbol)
+        dates = bars["date"]
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"), side="left")
+        hi = len(bars) if end is None else np.searchsorted(dates, np.datetime64(end, "D"), side="right")
+        return bars[lo:hi]
+
+    def append(self, symbol, dates, closes):
+        """Append bars newer than the last stored date; returns how many were written"""
+        with self._lock:
+            bars = np.empty(len(dates), dtype=BAR_DTYPE)
+            bars["date"] = dates
+            bars["close"] = closes
+
+            last = self.last_bar(symbol)
+            if last is not None:
+                bars = bars[bars["date"] > last["date"]]
+            if len(bars) == 0:
+                return 0
+
+            # Write the grown history to a temp file and rename it over the old
+            # one, so readers never map a partially written bar
+            path = self._path(symbol)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                if last is not None:
+                    with open(path, "rb") as current:
+                        shutil.copyfileobj(current, f)
+                f.write(bars.tobytes())
+            os.replace(tmp_path, path)
+            return len(bars)
+
+
+def sync_simulated_history(store, symbol, latest_price, drift, volatility, end_date, backfill_days, seed=42):
+    """Extend a ticker's stored history with simulated bars through end_date
+
+    An empty store is backfilled with backfill_days bars ending at
+    latest_price; otherwise only the days after the last stored bar are
+    simulated, continuing from its close.
+    """
+    last = store.last_bar(symbol)
+    if last is None:
+        first_date = end_date - datetime.timedelta(days=backfill_days - 1)
+        prices = simulate_price_paths([latest_price], [drift], [volatility], backfill_days, seed=seed)[:, 0]
+        # Rescale the path so it ends at latest_price rather than drifting away from it
+        prices *= latest_price / prices[-1]
+    else:
+        last_date = last["date"].item()
+        missing = (end_date - last_date).days
+        if missing <= 0:
+            return 0
+        first_date = last_date + datetime.timedelta(days=1)
+
+        # Seed from the ticker and resume date so every process extends history identically
+        resume_seed = [seed, zlib.crc32(symbol.encode()), last_date.toordinal()]
+        prices = simulate_price_paths([last["close"]], [drift], [volatility], missing + 1, seed=resume_seed)[1:, 0]
+
+    dates = np.arange(np.datetime64(first_date, "D"), np.datetime64(end_date, "D") + 1)
+    return store.append(symbol, dates, prices)
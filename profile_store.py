@@ -0,0 +1,148 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from student_profile import StudentProfile
+
+# Brackets are stored as labels rather than StudentProfile indices so saved
+# profiles survive PROFILE_OPTIONS being reordered or extended
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    profile_id TEXT PRIMARY KEY,
+    user_name TEXT,
+    user_age INTEGER,
+    user_status TEXT,
+    user_income TEXT,
+    user_savings TEXT,
+    user_debt TEXT,
+    user_goals TEXT,
+    updated_at REAL
+) WITHOUT ROWID
+"""
+
+_SELECT = "SELECT user_name, user_age, user_status, user_income, user_savings, user_debt, user_goals FROM profiles WHERE profile_id = ?"
+
+_UPSERT = """
+INSERT INTO profiles (profile_id, user_name, user_age, user_status, user_income, user_savings, user_debt, user_goals, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(profile_id) DO UPDATE SET
+    user_name = excluded.user_name,
+    user_age = excluded.user_age,
+    user_status = excluded.user_status,
+    user_income = excluded.user_income,
+    user_savings = excluded.user_savings,
+    user_debt = excluded.user_debt,
+    user_goals = excluded.user_goals,
+    updated_at = excluded.updated_at
+"""
+
+_DELETE = "DELETE FROM profiles WHERE profile_id = ?"
+
+
+class ProfileStore:
+    """SQLite profile store with pooled readers and a single batching writer
+
+    The database runs in WAL mode so reads never wait on the writer. Saves and
+    deletes are queued and applied by one background thread, which groups
+    everything submitted within batch_interval seconds into a single
+    transaction instead of committing once per form submission.
+    """
+
+    def __init__(self, path, pool_size=4, batch_interval=0.05, batch_size=200):
+        self.path = path
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._writer_conn = self._connect()
+        self._writer_conn.execute("PRAGMA journal_mode=WAL")
+        self._writer_conn.execute(_SCHEMA)
+
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+
+        self._writes = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="profile-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _reader(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def load(self, profile_id):
+        """Return the saved StudentProfile for a profile id, or None"""
+        with self._reader() as conn:
+            row = conn.execute(_SELECT, (profile_id,)).fetchone()
+        if row is None:
+            return None
+        *fields, goals = row
+        return StudentProfile.from_labels(*fields, json.loads(goals or "[]"))
+
+    def save(self, profile_id, profile):
+        """Queue an upsert of a StudentProfile; returns a Future"""
+        params = (
+            profile_id,
+            profile.name,
+            profile.age,
+            profile.label("status"),
+            profile.label("income"),
+            profile.label("savings"),
+            profile.label("debt"),
+            json.dumps(profile.goal_labels()),
+            time.time()
+        )
+        return self._submit(_UPSERT, params)
+
+    def delete(self, profile_id):
+        """Queue removal of a profile; returns a Future"""
+        return self._submit(_DELETE, (profile_id,))
+
+    def _submit(self, sql, params):
+        future = Future()
+        self._writes.put((sql, params, future))
+        return future
+
+    def _write_loop(self):
+        while True:
+            batch = [self._writes.get()]
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._writes.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._apply(batch)
+
+    def _apply(self, batch):
+        """Apply a batch of queued writes in one transaction"""
+        try:
+            self._writer_conn.execute("BEGIN IMMEDIATE")
+            for sql, params, _ in batch:
+                # Statements are cached per connection, so repeats reuse the prepared upsert
+                self._writer_conn.execute(sql, params)
+            self._writer_conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._writer_conn.in_transaction:
+                self._writer_conn.execute("ROLLBACK")
+            for _, _, future in batch:
+                future.set_exception(e)
+        else:
+            for _, _, future in batch:
+                future.set_result(True)
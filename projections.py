@@ -0,0 +1,51 @@
+import numpy as np
+
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def simulate_yearly_balances(start, monthly_contribution, annual_returns, volatilities, years, paths, seed=7):
+    """Simulate month-by-month balances for several investment options at once
+
+    Each option gets `paths` log-normal monthly return paths whose expected
+    growth matches its annual return, with monthly_contribution added at the
+    end of every month. Returns an (options, paths, years + 1) array of
+    end-of-year balances whose first column is the start balance.
+    """
+    annual_returns = np.asarray(annual_returns, dtype=float)[:, None, None]
+    volatilities = np.asarray(volatilities, dtype=float)[:, None, None]
+    months = years * 12
+
+    monthly_sigma = volatilities / np.sqrt(12)
+    monthly_mean = np.log1p(annual_returns) / 12 - 0.5 * monthly_sigma ** 2
+
+    rng = np.random.default_rng(seed)
+    log_returns = monthly_mean + monthly_sigma * rng.standard_normal((annual_returns.shape[0], paths, months))
+    growth = np.exp(np.cumsum(log_returns, axis=2))
+
+    # balance_t = growth_t * (start + contribution * sum of 1 / growth_s for s <= t),
+    # the closed form of balance_t = balance_(t-1) * (1 + r_t) + contribution
+    balances = growth * (start + monthly_contribution * np.cumsum(1 / growth, axis=2))
+
+    yearly = np.empty((annual_returns.shape[0], paths, years + 1))
+    yearly[:, :, 0] = start
+    yearly[:, :, 1:] = balances[:, :, 11::12]
+    return yearly
+
+
+def project_balances(start, monthly_contribution, annual_returns, volatilities, years, paths,
+                     seed=7, batch_paths=2500, percentiles=PERCENTILES):
+    """Percentile bands of end-of-year balances for several investment options
+
+    Paths are simulated in batches of batch_paths, each with its own seed from
+    one SeedSequence, so peak memory stays bounded by the batch size. Returns
+    an (options, len(percentiles), years + 1) array.
+    """
+    batch_seeds = np.random.SeedSequence(seed).spawn(-(-paths // batch_paths))
+    batches = [
+        simulate_yearly_balances(start, monthly_contribution, annual_returns, volatilities, years,
+                                 min(batch_paths, paths - i * batch_paths), batch_seed)
+        for i, batch_seed in enumerate(batch_seeds)
+    ]
+
+    yearly = np.concatenate(batches, axis=1)
+    return np.percentile(yearly, percentiles, axis=1).transpose(1, 0, 2)
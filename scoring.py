@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from config import PROFILE_OPTIONS
+
+BASE_SCORE = 50
+
+# Points per bracket, in PROFILE_OPTIONS order. The trailing 0 is picked up by
+# the -1 code pandas assigns to values outside the known brackets.
+SAVINGS_POINTS = np.array([0, 5, 10, 15, 20, 0])
+DEBT_POINTS = np.array([0, -5, -10, -15, -20, 0])
+INCOME_POINTS = np.array([5, 10, 15, 20, 25, 0])
+
+# Bracket codes that drive the savings allocation
+HIGH_DEBT_CODES = [3, 4]    # "$5001-25000", "$25000+"
+LOW_INCOME_CODES = [0, 1]   # "$0-500", "$501-1000"
+
+# Recommended savings allocation per bucket
+ALLOCATION_BUCKETS = ["Debt-Focused", "Simplified", "Balanced"]
+ALLOCATIONS = {
+    "Debt-Focused": {
+        'Category': ['Essentials', 'Debt Repayment', 'Emergency Fund', 'Flexible'],
+        'Percentage': [50, 20, 20, 10]
+    },
+    "Simplified": {
+        'Category': ['Essentials', 'Emergency Fund', 'Education & Flexible'],
+        'Percentage': [60, 20, 20]
+    },
+    "Balanced": {
+        'Category': ['Essentials', 'Financial Goals', 'Flexible'],
+        'Percentage': [50, 30, 20]
+    }
+}
+
+SCORE_BINS = [0, 20, 40, 60, 80, 101]
+SCORE_BIN_LABELS = ["0-19", "20-39", "40-59", "60-79", "80-100"]
+
+
+def encode_brackets(values, field):
+    """Encode bracket labels as PROFILE_OPTIONS codes (-1 for unknown labels)"""
+    return pd.Categorical(values, categories=PROFILE_OPTIONS[field]).codes
+
+
+def score_codes(savings, debt, income):
+    """Score arrays of bracket codes in one vectorized pass"""
+    score = BASE_SCORE + SAVINGS_POINTS[savings] + DEBT_POINTS[debt] + INCOME_POINTS[income]
+    return np.clip(score, 0, 100)
+
+
+def allocation_codes(debt, income):
+    """Map arrays of bracket codes to ALLOCATION_BUCKETS indices"""
+    return np.where(
+        np.isin(debt, HIGH_DEBT_CODES), 0,
+        np.where(np.isin(income, LOW_INCOME_CODES), 1, 2)
+    )
+
+
+# Every single-profile result precomputed from the vectorized rules, as nested
+# lists indexed by bracket code, so scoring one profile is a plain table lookup
+_BRACKET_COUNTS = tuple(len(PROFILE_OPTIONS[field]) for field in ("savings", "debt", "income"))
+_SCORE_TABLE = score_codes(*np.indices(_BRACKET_COUNTS)).tolist()
+_ALLOCATION_TABLE = [
+    [ALLOCATION_BUCKETS[code] for code in row]
+    for row in allocation_codes(*np.indices(_BRACKET_COUNTS[1:])).tolist()
+]
+
+
+def score_profile(savings, debt, income):
+    """Score a single profile given its bracket codes"""
+    return _SCORE_TABLE[savings][debt][income]
+
+
+def allocation_bucket(debt, income):
+    """Get the allocation bucket name for a single profile given its bracket codes"""
+    return _ALLOCATION_TABLE[debt][income]
+
+
+def score_profiles(profiles):
+    """Score a DataFrame of profiles with savings, debt and income bracket columns
+
+    Returns a copy with 'Score' and 'Allocation' columns added.
+    """
+    missing = [column for column in ("savings", "debt", "income") if column not in profiles.columns]
+    if missing:
+        raise ValueError(f"Profile data is missing required columns: {', '.join(missing)}")
+
+    savings = encode_brackets(profiles["savings"], "savings")
+    debt = encode_brackets(profiles["debt"], "debt")
+    income = encode_brackets(profiles["income"], "income")
+
+    scored = profiles.copy()
+    scored["Score"] = score_codes(savings, debt, income)
+    scored["Allocation"] = pd.Categorical.from_codes(allocation_codes(debt, income), categories=ALLOCATION_BUCKETS)
+    return scored
+
+
+def score_distribution(scores):
+    """Count scores per SCORE_BINS range"""
+    counts, _ = np.histogram(scores, bins=SCORE_BINS)
+    return pd.DataFrame({"Score Range": SCORE_BIN_LABELS, "Students": counts})
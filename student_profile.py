@@ -0,0 +1,75 @@
+from config import PROFILE_OPTIONS
+
+# Option label -> index, per PROFILE_OPTIONS field
+_INDEX = {field: {option: i for i, option in enumerate(options)} for field, options in PROFILE_OPTIONS.items()}
+
+# One bit per financial goal, in PROFILE_OPTIONS order
+GOAL_BITS = {goal: 1 << i for i, goal in enumerate(PROFILE_OPTIONS["goals"])}
+
+# Bracket thresholds behind the action items
+_LOW_SAVINGS_MAX = _INDEX["savings"]["$101-500"]
+_SIGNIFICANT_DEBT_MIN = _INDEX["debt"]["$1000-5000"]
+_STEADY_INCOME_MIN = _INDEX["income"]["$1001-2000"]
+
+
+class StudentProfile:
+    """A student's financial profile, stored compactly in one session state entry
+
+    status, income, savings and debt hold indices into the matching
+    PROFILE_OPTIONS list and goals is a bitmask of GOAL_BITS, so scoring and
+    recommendations work on small ints instead of comparing display strings.
+    """
+
+    __slots__ = ("name", "age", "status", "income", "savings", "debt", "goals")
+
+    def __init__(self, name="", age=20, status=1, income=0, savings=0, debt=0, goals=GOAL_BITS["Emergency Fund"]):
+        self.name = name
+        self.age = age
+        self.status = status
+        self.income = income
+        self.savings = savings
+        self.debt = debt
+        self.goals = goals
+
+    @classmethod
+    def from_labels(cls, name, age, status, income, savings, debt, goals):
+        """Build a profile from form or stored option labels (unknown labels map to the first option)"""
+        return cls(
+            name=name,
+            age=age,
+            status=_INDEX["status"].get(status, 0),
+            income=_INDEX["income"].get(income, 0),
+            savings=_INDEX["savings"].get(savings, 0),
+            debt=_INDEX["debt"].get(debt, 0),
+            goals=sum(GOAL_BITS.get(goal, 0) for goal in set(goals))
+        )
+
+    def label(self, field):
+        """Get the display label for one of status, income, savings or debt"""
+        return PROFILE_OPTIONS[field][getattr(self, field)]
+
+    def goal_labels(self):
+        """Get the selected goals as labels, in PROFILE_OPTIONS order"""
+        return [goal for goal, bit in GOAL_BITS.items() if self.goals & bit]
+
+    def has_goal(self, goal):
+        return bool(self.goals & GOAL_BITS[goal])
+
+    @property
+    def low_savings(self):
+        """Savings of $500 or less"""
+        return self.savings <= _LOW_SAVINGS_MAX
+
+    @property
+    def significant_debt(self):
+        """Debt of $1000 or more"""
+        return self.debt >= _SIGNIFICANT_DEBT_MIN
+
+    @property
+    def steady_income(self):
+        """Monthly income over $1000"""
+        return self.income >= _STEADY_INCOME_MIN
+
+    def __repr__(self):
+        fields = ", ".join(f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__)
+        return f"StudentProfile({fields})"
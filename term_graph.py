@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import zlib
+
+import numpy as np
+
+from term_search import TITLE_WEIGHT, char_trigrams, content_tokens
+
+GRAPH_VERSION = 1
+
+
+def entry_digest(entry):
+    """Fingerprint one catalog entry so edited entries are re-embedded"""
+    return zlib.crc32(json.dumps(entry, sort_keys=True).encode("utf-8"))
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embeddings with no model download or network access
+
+    Word unigrams and bigrams (plus character trigrams of title and alias
+    words, so "credit" and "credits" still meet) are hashed into a fixed
+    number of signed buckets with sublinear counts, and each vector is
+    L2-normalized so a dot product is the cosine similarity. An entry's
+    vector depends only on that entry, which is what lets the graph add
+    terms without re-embedding the rest of the catalog.
+    """
+
+    def __init__(self, dimensions=256):
+        self.dimensions = dimensions
+
+    def _features(self, names, body=""):
+        counts = {}
+        for text, weight, grams in ((" ".join(names), TITLE_WEIGHT, True), (body, 1, False)):
+            words = content_tokens(text)
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            if grams:
+                features += [f"#{gram}" for word in words for gram in char_trigrams(word)]
+            for feature in features:
+                counts[feature] = counts.get(feature, 0) + weight
+        return counts
+
+    def _vector(self, counts):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in counts.items():
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dimensions] += sign * (1 + np.log(count))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_entries(self, entries):
+        """Return a contiguous (len(entries), dimensions) float32 matrix"""
+        matrix = np.zeros((len(entries), self.dimensions), dtype=np.float32)
+        for i, entry in enumerate(entries):
+            names = [entry["term"], *entry.get("aliases", [])]
+            body = f"{entry.get('content', '')} {entry.get('examples', '')}"
+            matrix[i] = self._vector(self._features(names, body))
+        return matrix
+
+    def embed_query(self, text):
+        """Embed a bare term name (e.g. one missing from the catalog)"""
+        return self._vector(self._features([text]))
+
+
+def _top_k(scores, ids, k):
+    """Best k (ids, scores) per row, highest first, padded with -1 / -inf"""
+    rows, columns = scores.shape
+    keep = min(k, columns)
+    if keep < columns:
+        best = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+    else:
+        best = np.broadcast_to(np.arange(columns), (rows, columns))
+    best_scores = np.take_along_axis(scores, best, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    best = np.take_along_axis(best, order, axis=1)
+
+    neighbors = np.full((rows, k), -1, dtype=np.int32)
+    neighbor_scores = np.full((rows, k), -np.inf, dtype=np.float32)
+    neighbors[:, :keep] = np.take_along_axis(ids, best, axis=1)
+    neighbor_scores[:, :keep] = np.take_along_axis(best_scores, order, axis=1)
+    return neighbors, neighbor_scores
+
+
+class TermGraph:
+    """Top-k related-term adjacency table over embedded catalog terms
+
+    Row i of neighbors holds the ids of the k terms most similar to term i,
+    so related terms are one array lookup. Similarities are computed a block
+    of rows at a time, and added terms are compared only against the
+    catalog (existing rows just merge the new terms into their top k), so
+    the full similarity matrix is never held or recomputed.
+    """
+
+    def __init__(self, titles, vectors, neighbors, scores, digests, embedder):
+        self.titles = list(titles)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.neighbors = neighbors
+        self.scores = scores
+        self.digests = list(digests)
+        self.embedder = embedder
+        self._ids = {title: i for i, title in enumerate(self.titles)}
+
+    @classmethod
+    def build(cls, entries, k=8, dimensions=256, block_rows=1024):
+        """Embed every entry and precompute its k nearest neighbours"""
+        embedder = HashingEmbedder(dimensions)
+        vectors = embedder.embed_entries(entries)
+        neighbors = np.full((len(entries), k), -1, dtype=np.int32)
+        scores = np.full((len(entries), k), -np.inf, dtype=np.float32)
+        ids = np.arange(len(entries), dtype=np.int32)[None, :]
+        for start in range(0, len(entries), block_rows):
+            end = min(start + block_rows, len(entries))
+            block = vectors[start:end] @ vectors.T
+            block[np.arange(end - start), np.arange(start, end)] = -np.inf
+            neighbors[start:end], scores[start:end] = _top_k(block, np.broadcast_to(ids, block.shape), k)
+        return cls([entry["term"] for entry in entries], vectors, neighbors, scores,
+                   [entry_digest(entry) for entry in entries], embedder)
+
+    def add(self, entries):
+        """Index new entries, updating only the neighbour rows they displace"""
+        old_count, added = len(self.titles), len(entries)
+        k = self.neighbors.shape[1]
+        new_vectors = self.embedder.embed_entries(entries)
+        vectors = np.concatenate([self.vectors, new_vectors])
+        new_ids = np.arange(old_count, old_count + added, dtype=np.int32)
+
+        similarities = new_vectors @ vectors.T
+        similarities[np.arange(added), new_ids] = -np.inf
+        ids = np.arange(old_count + added, dtype=np.int32)[None, :]
+        new_neighbors, new_scores = _top_k(similarities, np.broadcast_to(ids, similarities.shape), k)
+
+        # Existing rows keep their top k unless a new term beats one of them
+        candidate_ids = np.concatenate([self.neighbors, np.broadcast_to(new_ids, (old_count, added))], axis=1)
+        candidate_scores = np.concatenate([self.scores, similarities[:, :old_count].T], axis=1)
+        old_neighbors, old_scores = _top_k(candidate_scores, candidate_ids, k)
+
+        self.vectors = vectors
+        self.neighbors = np.concatenate([old_neighbors, new_neighbors])
+        self.scores = np.concatenate([old_scores, new_scores])
+        for entry in entries:
+            self._ids[entry["term"]] = len(self.titles)
+            self.titles.append(entry["term"])
+            self.digests.append(entry_digest(entry))
+
+    def related(self, title, k=3, min_score=0.2):
+        """Up to k catalog titles most related to a catalog title, scoring above min_score
+
+        Signed hashing makes unrelated vectors score around +/-1/sqrt(dimensions)
+        by collision alone, so min_score must sit well above that noise floor;
+        no neighbours is better than arbitrary ones.
+        """
+        i = self._ids.get(title)
+        if i is None:
+            return []
+        row = self.neighbors[i, :k][self.scores[i, :k] > min_score]
+        return [self.titles[j] for j in row]
+
+    def nearest(self, text, k=3, min_score=0.2):
+        """Up to k catalog titles most similar to a term that isn't in the catalog, scoring above min_score"""
+        if not self.titles:
+            return []
+        similarities = self.vectors @ self.embedder.embed_query(text)
+        neighbors, scores = _top_k(similarities[None, :], np.arange(len(self.titles))[None, :], k)
+        return [self.titles[j] for j in neighbors[0][scores[0] > min_score]]
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved graph, or return None if it is missing or from another version"""
+        try:
+            with np.load(path) as saved:
+                arrays = {name: saved[name] for name in saved.files}
+        except (OSError, ValueError):
+            return None
+        if arrays.get("version") != GRAPH_VERSION:
+            return None
+        return cls(arrays["titles"].tolist(), arrays["vectors"], arrays["neighbors"], arrays["scores"],
+                   arrays["digests"].tolist(), HashingEmbedder(arrays["vectors"].shape[1]))
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, version=np.array(GRAPH_VERSION), titles=np.array(self.titles, dtype=str),
+                 vectors=self.vectors, neighbors=self.neighbors, scores=self.scores,
+                 digests=np.array(self.digests, dtype=np.int64))
+        os.replace(tmp_path, path)
+
+
+def sync_graph(entries, path, k=8, dimensions=256):
+    """Load the saved graph and bring it up to date with the catalog, saving any change
+
+    Entries appended since the last run are added incrementally; an edited,
+    removed or reordered entry (or a different k or dimensions) triggers a
+    full rebuild.
+    """
+    graph = TermGraph.load(path)
+    digests = [entry_digest(entry) for entry in entries]
+    if (graph is None or graph.neighbors.shape[1] != k or graph.vectors.shape[1] != dimensions
+            or graph.digests != digests[:len(graph.digests)]):
+        graph = TermGraph.build(entries, k, dimensions)
+    elif len(graph.digests) < len(entries):
+        graph.add(entries[len(graph.digests):])
+    else:
+        return graph
+    graph.save(path)
+    return graph
+
+
+if __name__ == "__main__":
+    from config import RELATED_TERMS_CONFIG, TERMS_DATA_PATH
+
+    parser = argparse.ArgumentParser(description="Build or update the related-term graph for the term catalog")
+    parser.add_argument("--catalog", default=TERMS_DATA_PATH)
+    parser.add_argument("--output", default=RELATED_TERMS_CONFIG["graph_path"])
+    parser.add_argument("--rebuild", action="store_true", help="recompute every vector and neighbour list")
+    args = parser.parse_args()
+
+    with open(args.catalog, encoding="utf-8") as f:
+        catalog = json.load(f)
+    if args.rebuild and os.path.exists(args.output):
+        os.remove(args.output)
+    graph = sync_graph(catalog, args.output, RELATED_TERMS_CONFIG["neighbors"], RELATED_TERMS_CONFIG["dimensions"])
+    print(f"{len(graph.titles)} terms, {graph.neighbors.shape[1]} neighbours each -> {args.output}")
@@ -0,0 +1,270 @@
+import bisect
+import hashlib
+import os
+import re
+
+import numpy as np
+
+from term_store import normalize_term
+
+INDEX_VERSION = 2
+
+# Title and alias words count this many times over body words
+TITLE_WEIGHT = 3
+
+# Keep "401(k)" and "401k" as the same token
+_PARENTHESIZED = re.compile(r"(\w)\((\w)\)")
+
+# Words too common to say anything about which term a text is about
+STOPWORDS = {
+    "a", "all", "an", "and", "are", "as", "at", "be", "but", "by", "can", "do", "for", "from", "ha", "has",
+    "have", "her", "his", "how", "i", "if", "in", "into", "is", "it", "its", "like", "more", "my", "not",
+    "of", "on", "or", "our", "so", "than", "that", "the", "their", "them", "they", "this", "to", "up",
+    "wa", "was", "we", "what", "when", "which", "will", "with", "you", "your"
+}
+
+# Words this short are never spelling-corrected: too many real words sit one edit apart
+MAX_UNCORRECTED_LENGTH = 4
+
+
+def tokenize(text):
+    """Split text into normalized, singularized word tokens"""
+    words = normalize_term(_PARENTHESIZED.sub(r"\1\2", text.lower())).replace("/", " ").split()
+    return [_singular(word) for word in words]
+
+
+def content_tokens(text):
+    """Tokens of text without stopwords"""
+    return [token for token in tokenize(text) if token not in STOPWORDS]
+
+
+def _singular(word):
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("xes", "ches", "shes", "sses")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def char_trigrams(word):
+    """Character trigrams of a word, padded so its first and last letters count too"""
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def catalog_digest(path):
+    """Fingerprint a catalog file so a stale persisted index is rebuilt"""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _csr(groups, size):
+    """Flatten a list of lists of ints into (offsets, values) arrays"""
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(group) for group in groups])
+    values = np.fromiter((value for group in groups for value in group), dtype=np.int32, count=offsets[-1])
+    return offsets, values
+
+
+class SearchIndex:
+    """BM25 inverted index over term titles, aliases, explanations and examples
+
+    Postings, document lengths, the character-trigram index over the
+    vocabulary (for typo correction), the sorted completion keys (for
+    prefix autocomplete) and the token keys of every title and alias (for
+    exact matches that survive a typo) are all flat arrays, so the index
+    saves to and loads from a single .npz file without rebuilding anything.
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.titles = arrays["titles"].tolist()
+        self.vocab = {word: i for i, word in enumerate(arrays["vocab"].tolist())}
+        self.words = arrays["vocab"].tolist()
+        self.completion_keys = arrays["completion_keys"].tolist()
+        self.trigrams = {gram: i for i, gram in enumerate(arrays["trigram_keys"].tolist())}
+        self.names = dict(zip(arrays["name_keys"].tolist(), arrays["name_docs"].tolist()))
+
+        doc_lengths = arrays["doc_lengths"]
+        self.document_frequency = np.diff(arrays["posting_offsets"])
+        df = self.document_frequency
+        self.idf = np.log1p((len(doc_lengths) - df + 0.5) / (df + 0.5))
+        self._length_norm = 1 - 0.75 + 0.75 * doc_lengths / max(doc_lengths.mean(), 1.0)
+
+    @classmethod
+    def build(cls, entries, digest=""):
+        """Index a list of catalog entries"""
+        vocab = {}
+        postings = []
+        doc_lengths = []
+        completions = []
+        name_keys = {}
+        for doc, entry in enumerate(entries):
+            counts = {}
+            names = [entry["term"], *entry.get("aliases", [])]
+            for token in content_tokens(" ".join(names)):
+                counts[token] = counts.get(token, 0) + TITLE_WEIGHT
+            for token in content_tokens(f"{entry.get('content', '')} {entry.get('examples', '')}"):
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                if token not in vocab:
+                    vocab[token] = len(vocab)
+                    postings.append([])
+                postings[vocab[token]].append((doc, count))
+            doc_lengths.append(sum(counts.values()))
+
+            # Complete on the start of every word of the title and aliases
+            for name in names:
+                words = normalize_term(name).split()
+                completions.extend((" ".join(words[i:]), doc) for i in range(len(words)))
+                # First entry wins, as in the term store
+                name_keys.setdefault(" ".join(content_tokens(name)), doc)
+
+        words = list(vocab)
+        posting_offsets, posting_docs = _csr([[doc for doc, _ in posting] for posting in postings], len(words))
+        posting_counts = np.fromiter((count for posting in postings for _, count in posting),
+                                     dtype=np.float32, count=posting_offsets[-1])
+
+        trigram_words = {}
+        for i, word in enumerate(words):
+            for gram in char_trigrams(word):
+                trigram_words.setdefault(gram, []).append(i)
+        trigram_keys = sorted(trigram_words)
+        trigram_offsets, trigram_values = _csr([trigram_words[gram] for gram in trigram_keys], len(trigram_keys))
+
+        completions = sorted(set(completions))
+        return cls({
+            "version": np.array(INDEX_VERSION),
+            "digest": np.array(digest),
+            "titles": np.array([entry["term"] for entry in entries]),
+            "vocab": np.array(words),
+            "posting_offsets": posting_offsets,
+            "posting_docs": posting_docs,
+            "posting_counts": posting_counts,
+            "doc_lengths": np.array(doc_lengths, dtype=np.float32),
+            "trigram_keys": np.array(trigram_keys),
+            "trigram_offsets": trigram_offsets,
+            "trigram_words": trigram_values,
+            "completion_keys": np.array([key for key, _ in completions]),
+            "completion_docs": np.array([doc for _, doc in completions], dtype=np.int32),
+            "name_keys": np.array(list(name_keys)),
+            "name_docs": np.array(list(name_keys.values()), dtype=np.int32)
+        })
+
+    @classmethod
+    def load(cls, path, digest):
+        """Load a saved index, or return None if it is missing, stale or from another version"""
+        try:
+            with np.load(path) as saved:
+                arrays = {name: saved[name] for name in saved.files}
+        except (OSError, ValueError):
+            return None
+        if arrays.get("version") != INDEX_VERSION or str(arrays.get("digest")) != digest:
+            return None
+        return cls(arrays)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, **self.arrays)
+        os.replace(tmp_path, path)
+
+    def correct(self, token):
+        """Return the closest vocabulary word to a token, or None if nothing is close enough"""
+        if token in self.vocab:
+            return token
+        if len(token) <= MAX_UNCORRECTED_LENGTH:
+            return None
+
+        grams = [self.trigrams[gram] for gram in char_trigrams(token) if gram in self.trigrams]
+        if not grams:
+            return None
+        offsets = self.arrays["trigram_offsets"]
+        values = self.arrays["trigram_words"]
+        shared = np.bincount(np.concatenate([values[offsets[g]:offsets[g + 1]] for g in grams]))
+
+        # Only check edit distance for the words sharing the most trigrams
+        candidates = np.argsort(-shared, kind="stable")[:20]
+        limit = 1 if len(token) < 8 else 2
+        best = None
+        for word_id in candidates:
+            if shared[word_id] == 0:
+                break
+            distance = edit_distance(token, self.words[word_id], limit)
+            if distance <= limit:
+                rank = (distance, -self.document_frequency[word_id])
+                if best is None or rank < best[0]:
+                    best = (rank, self.words[word_id])
+        return best[1] if best else None
+
+    def match(self, query):
+        """Return the title whose title or alias words are the query's, correcting misspelled words, or None"""
+        tokens = [self.correct(token) for token in content_tokens(query)]
+        if not tokens or None in tokens:
+            return None
+        doc = self.names.get(" ".join(tokens))
+        return None if doc is None else self.titles[doc]
+
+    def search(self, query, k=10):
+        """Return up to k (title, score) pairs ranked by BM25, correcting misspelled words
+
+        Stopwords are ignored, and a title is only returned if it contains more
+        than half of the remaining query words, so one common or misread word
+        can't pull in an unrelated term.
+        """
+        query_tokens = set(content_tokens(query))
+        tokens = {self.correct(token) for token in query_tokens} - {None}
+        if not tokens:
+            return []
+
+        offsets = self.arrays["posting_offsets"]
+        docs = self.arrays["posting_docs"]
+        counts = self.arrays["posting_counts"]
+        scores = np.zeros(len(self.titles), dtype=np.float32)
+        matched = np.zeros(len(self.titles), dtype=np.int32)
+        k1 = 1.5
+        for token in tokens:
+            word_id = self.vocab[token]
+            start, end = offsets[word_id], offsets[word_id + 1]
+            tf = counts[start:end]
+            # A token's postings hold each document once, so plain fancy-index add is safe
+            scores[docs[start:end]] += self.idf[word_id] * tf * (k1 + 1) / (tf + k1 * self._length_norm[docs[start:end]])
+            matched[docs[start:end]] += 1
+
+        hits = np.flatnonzero(matched * 2 > len(query_tokens))
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(self.titles[doc], float(scores[doc])) for doc in hits]
+
+    def complete(self, prefix, k=5):
+        """Return up to k titles with a title or alias word starting with prefix"""
+        prefix = normalize_term(prefix)
+        if not prefix:
+            return []
+        docs = self.arrays["completion_docs"]
+        titles = []
+        i = bisect.bisect_left(self.completion_keys, prefix)
+        while i < len(self.completion_keys) and self.completion_keys[i].startswith(prefix) and len(titles) < k:
+            title = self.titles[docs[i]]
+            if title not in titles:
+                titles.append(title)
+            i += 1
+        return titles
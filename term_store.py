@@ -0,0 +1,68 @@
+import json
+import re
+
+# Characters that never change the meaning of a term lookup
+_PUNCTUATION = re.compile(r"[^a-z0-9/%+ ]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_term(text):
+    """Normalize a term or query into an index key"""
+    text = text.lower().replace("&", " and ")
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _word_variants(word):
+    """Return the singular and plural spellings of a single word"""
+    variants = {word}
+    if len(word) > 3 and word.endswith("ies"):
+        variants.add(word[:-3] + "y")
+    elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        variants.add(word[:-1])
+    elif word.endswith("y") and len(word) > 2 and word[-2] not in "aeiou":
+        variants.add(word[:-1] + "ies")
+    elif word.endswith(("s", "x", "ch", "sh")):
+        variants.add(word + "es")
+    elif word[-1:].isalpha():
+        variants.add(word + "s")
+    return variants
+
+
+def key_variants(text):
+    """Return every normalized key a term or alias should be indexed under"""
+    key = normalize_term(text)
+    if not key:
+        return set()
+    head, _, last = key.rpartition(" ")
+    prefix = f"{head} " if head else ""
+    return {prefix + variant for variant in _word_variants(last)}
+
+
+class TermStore:
+    """Read-only financial term catalog with a normalized-key index"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.index = {}
+        for entry in entries:
+            for name in [entry["term"], *entry.get("aliases", [])]:
+                for key in key_variants(name):
+                    # First entry wins so a later alias can't hijack a title
+                    self.index.setdefault(key, entry)
+
+    @classmethod
+    def from_file(cls, path):
+        """Build a store from a JSON list of term entries"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def lookup(self, term):
+        """Return the shared entry for a term, or None if it isn't indexed"""
+        return self.index.get(normalize_term(term))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, term):
+        return self.lookup(term) is not None
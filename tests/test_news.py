@@ -0,0 +1,33 @@
+import email.utils
+import time
+
+from news import NewsIngestor, NewsStore
+
+
+def write_feed(path, items):
+    entries = "".join(
+        f"<item><guid>{guid}</guid><title>{title}</title>"
+        + (f"<pubDate>{email.utils.formatdate(published)}</pubDate>" if published else "")
+        + "</item>"
+        for guid, title, published in items
+    )
+    path.write_text(f"<rss><channel>{entries}</channel></rss>", encoding="utf-8")
+
+
+def test_undated_item_does_not_hide_late_dated_item(tmp_path):
+    feed = tmp_path / "feed.xml"
+    ingestor = NewsIngestor(NewsStore(), feed_dir=str(tmp_path))
+
+    write_feed(feed, [("undated", "Fed holds interest rates steady", None)])
+    assert ingestor.ingest_once() == 1
+
+    # Published an hour before the undated item was ingested, but only now in the feed
+    write_feed(feed, [
+        ("undated", "Fed holds interest rates steady", None),
+        ("late", "Student loan repayments resume next month", time.time() - 3600)
+    ])
+    assert ingestor.ingest_once() == 1
+    assert {story["title"] for story in ingestor.store.top()} == {
+        "Fed holds interest rates steady", "Student loan repayments resume next month"
+    }
+    assert ingestor.ingest_once() == 0
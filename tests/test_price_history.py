@@ -0,0 +1,45 @@
+import datetime
+import json
+import os
+
+import numpy as np
+import pytest
+
+from config import HISTORY_CONFIG, MARKET_TICKERS, QUOTES_FIXTURE_PATH
+from market_metrics import MarketMetrics
+from market_providers import FixtureProvider
+from price_history import PriceHistoryStore
+from utils import _sync_market_history
+
+
+@pytest.fixture
+def quotes():
+    with open(QUOTES_FIXTURE_PATH, encoding="utf-8") as f:
+        return {quote["symbol"]: quote for quote in json.load(f)}
+
+
+def test_backfill_ends_at_quoted_price(tmp_path, quotes):
+    store = PriceHistoryStore(str(tmp_path))
+    metrics = MarketMetrics(HISTORY_CONFIG["volatility_window"], HISTORY_CONFIG["periods_per_year"])
+    synced = _sync_market_history(store, FixtureProvider(QUOTES_FIXTURE_PATH), metrics)
+
+    for ticker in MARKET_TICKERS.values():
+        symbol = ticker["symbol"]
+        last = store.last_bar(symbol)
+        assert last["date"].item() == synced["end_date"]
+        assert last["close"] == pytest.approx(quotes[symbol]["price"])
+        assert len(store.read(symbol)) == HISTORY_CONFIG["backfill_days"]
+
+
+def test_append_replaces_file_without_disturbing_open_views(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    dates = np.arange(np.datetime64("2026-01-01"), np.datetime64("2026-01-11"))
+    store.append("SPY", dates[:5], np.arange(5.0))
+    before = store.read("SPY")
+
+    assert store.append("SPY", dates, np.arange(10.0)) == 5
+    assert before["close"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert store.read("SPY", end=datetime.date(2026, 1, 10))["close"].tolist() == list(np.arange(10.0))
+    # Every stored byte is a whole bar and no temp file is left behind
+    assert os.path.getsize(tmp_path / "SPY.bin") == 10 * store.read("SPY").itemsize
+    assert os.listdir(tmp_path) == ["SPY.bin"]
@@ -0,0 +1,49 @@
+import pytest
+
+from config import SEARCH_CONFIG
+from utils import search_terms
+
+
+@pytest.mark.parametrize("query", [
+    "Roth IRA",
+    "what is a mortgage",
+    "car insurance",
+    "overdraft fees",
+    "xyzzy foo",
+])
+def test_queries_naming_no_catalog_term_open_nothing(query):
+    term, _ = search_terms(query)
+    assert term is None
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Budgeting", "Budgeting"),
+    ("fico", "Credit Scores"),
+    ("401k", "401(k)"),
+    ("budgting", "Budgeting"),
+    ("compound intrest", "Compound Interest"),
+    ("taxes for studnts", "Taxes for Students"),
+    ("credit scor", "Credit Scores"),
+])
+def test_exact_alias_misspelled_and_prefix_queries_open_the_term(query, expected):
+    term, suggestions = search_terms(query)
+    assert term == expected
+    assert expected not in suggestions
+
+
+def test_short_words_are_not_spelling_corrected():
+    # "roth" is one edit from "both", "fees" from "free" and "foo" from "for"
+    assert search_terms("roth")[1] == []
+    assert search_terms("fees")[1] == []
+    assert search_terms("foo")[1] == []
+
+
+def test_stopwords_alone_match_nothing():
+    assert search_terms("what is the") == (None, [])
+
+
+def test_short_prefixes_only_suggest():
+    term, suggestions = search_terms("in")
+    assert term is None
+    assert suggestions
+    assert len(suggestions) <= SEARCH_CONFIG["max_suggestions"]
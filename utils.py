@@ -1,15 +1,132 @@
+import datetime
+import io
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import numpy as np
-from config import CUSTOM_CSS
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from config import (CHART_CONFIG, CUSTOM_CSS, TERMS_DATA_PATH, BANK_DATA_PATH, LOAN_DATA_PATH, QUOTES_FIXTURE_PATH,
+                    PROFILE_DB_PATH, SEARCH_CONFIG, RELATED_TERMS_CONFIG, MARKET_TICKERS, HISTORY_CONFIG, MARKET_REFRESH_CONFIG, BANK_CATALOG_CONFIG, NEWS_CONFIG, LOAN_SCENARIOS, INVESTMENT_OPTIONS, BRACKET_AMOUNTS,
+                    PROJECTION_CONFIG, API_CONFIG, LLM_CONFIG, PREFETCH_CONFIG, PERF_CONFIG)
+from llm_cache import ResponseCache, make_cache_key
+from perf import SpanRegistry, TimingLog, configure as configure_perf, percentile, process_spans, span, timed
+from profile_store import ProfileStore
+from term_store import TermStore, normalize_term
+
+# pandas, NumPy, Plotly and requests (and the modules built on them) are
+# imported inside the functions that use them, so pages that never chart or
+# fetch anything - like the home page - don't pay their import cost.
+
+def _session_spans():
+    """Get this session's span histograms, or None when not on a script thread"""
+    if get_script_run_ctx() is None:
+        return None
+    if 'perf_spans' not in st.session_state:
+        st.session_state.perf_spans = SpanRegistry()
+    return st.session_state.perf_spans
+
+# Must run before the @timed decorators below are applied
+configure_perf(
+    PERF_CONFIG["enabled"],
+    export_path=PERF_CONFIG["export_path"],
+    export_interval=PERF_CONFIG["export_interval_seconds"],
+    session_spans=_session_spans
+)
 
 def load_css():
     """Load custom CSS styles"""
     st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_figure_cache():
+    """Create the figure cache shared by every session"""
+    from charts import FigureCache
+    
+    return FigureCache(CHART_CONFIG["figure_cache_entries"])
+
+def build_figure(kind, data, max_points=None, **spec):
+    """Get a Plotly Express figure (px.<kind>) for data and spec, reusing unchanged figures"""
+    return get_figure_cache().get_figure(kind, data, max_points=max_points, **spec)
+
+@st.cache_resource
+def get_timing_log():
+    """Get the process-wide log of page and fragment rerun timings"""
+    return TimingLog()
+
+def timed_section(name):
+    """Time a block of page code into the shared timing log"""
+    return get_timing_log().time(name)
+
+class _PageRun:
+    """One run of a page script, recorded into the timing log when it is dropped"""
+    
+    def __init__(self, page):
+        self.log = get_timing_log()
+        self.name = f"{page}.full_run"
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+    
+    def __del__(self):
+        self.log.record(self.name, time.perf_counter() - self.wall_start, time.thread_time() - self.cpu_start)
+
+_page_runs = threading.local()
+
+def time_page_run(page):
+    """Time the rest of this page script run; call once, right after st.set_page_config
+    
+    Streamlit gives each run its own script thread, and a run cut short by
+    st.rerun() or st.switch_page() is followed by the next one on that same
+    thread. So the run is recorded when the next run replaces it or when the
+    thread exits, whether it finished normally, stopped early or raised.
+    """
+    _page_runs.current = _PageRun(page)
+
+@st.cache_resource
+def get_profile_store():
+    """Open the SQLite profile store shared by every session"""
+    return ProfileStore(PROFILE_DB_PATH)
+
+def restore_saved_profile():
+    """Load a returning student's saved profile once, at the start of their session
+    
+    Profiles are identified by the `profile` query parameter, which is kept in
+    the URL on every page so students can bookmark it and come back later.
+    """
+    if 'profile_restored' not in st.session_state:
+        st.session_state.profile_restored = True
+        profile_id = st.query_params.get("profile")
+        if profile_id and 'student_profile' not in st.session_state:
+            profile = get_profile_store().load(profile_id)
+            if profile is not None:
+                st.session_state.student_profile = profile
+                st.session_state.profile_id = profile_id
+    
+    # Page navigation drops query parameters, so put the profile id back
+    if 'profile_id' in st.session_state and st.query_params.get("profile") != st.session_state.profile_id:
+        st.query_params["profile"] = st.session_state.profile_id
+
+def save_profile():
+    """Persist the current session's profile, assigning it an id on first save"""
+    if 'profile_id' not in st.session_state:
+        st.session_state.profile_id = uuid.uuid4().hex
+    st.query_params["profile"] = st.session_state.profile_id
+    return get_profile_store().save(st.session_state.profile_id, st.session_state.student_profile)
+
+def forget_profile():
+    """Delete the current session's saved profile"""
+    profile_id = st.session_state.pop('profile_id', None)
+    if profile_id is not None:
+        get_profile_store().delete(profile_id)
+    if "profile" in st.query_params:
+        del st.query_params["profile"]
+
 def display_sidebar():
     """Display sidebar navigation and user profile"""
+    restore_saved_profile()
+    
     with st.sidebar:
         st.markdown("# FLex 💰")
         st.markdown("### Your Financial Literacy Assistant")
@@ -26,9 +143,10 @@ def display_sidebar():
         # User profile section
         st.markdown("---")
         with st.expander("Your Profile"):
-            if 'user_name' in st.session_state:
-                st.write(f"Hi, {st.session_state.user_name}!")
-                st.write(f"Status: {st.session_state.get('user_status', 'Student')}")
+            profile = st.session_state.get('student_profile')
+            if profile is not None:
+                st.write(f"Hi, {profile.name}!")
+                st.write(f"Status: {profile.label('status')}")
                 if st.button("Edit Profile"):
                     st.session_state.edit_profile = True
                     # Use native page navigation
@@ -42,171 +160,553 @@ def display_sidebar():
         # Footer in sidebar
         st.markdown("---")
         st.markdown("Powered by Palmyra-Fin-70B")
+        
+        # Hidden debug section, shown by adding ?debug=1 to the URL
+        if st.query_params.get("debug") == "1":
+            with st.expander("Performance"):
+                st.caption("Server-side rerun timings for this process")
+                st.dataframe(get_timing_log().summary(), hide_index=True)
+                if LLM_CONFIG["enabled"]:
+                    st.caption("Fresh LLM generations, all sessions")
+                    st.dataframe(summarize_llm_latency(), hide_index=True)
+                if PERF_CONFIG["enabled"]:
+                    st.caption("Hot paths, this session")
+                    st.dataframe(_session_spans().summary(), hide_index=True)
+                    st.caption("Hot paths, all sessions")
+                    st.dataframe(process_spans().summary(), hide_index=True)
+                    if LLM_CONFIG["enabled"]:
+                        st.caption("LLM gateway, all sessions")
+                        st.dataframe([get_llm_gateway().stats()], hide_index=True)
+                    if LLM_CONFIG["enabled"] and PREFETCH_CONFIG["enabled"]:
+                        st.caption("Related-term prefetch, all sessions")
+                        st.dataframe([get_prefetcher().stats()], hide_index=True)
+                    st.caption(f"Exported to {PERF_CONFIG['export_path']}")
 
-def calculate_financial_score():
-    """Calculate a financial health score based on user profile"""
-    # This is a simplified mock calculation
-    score = 50  # Base score
+@timed("calculate_financial_score")
+def calculate_financial_score(profile):
+    """Calculate a financial health score based on a StudentProfile"""
+    from scoring import score_profile
     
-    # Add points for savings
-    savings_map = {"$0-100": 0, "$101-500": 5, "$501-1000": 10, "$1001-5000": 15, "$5000+": 20}
-    score += savings_map.get(st.session_state.user_savings, 0)
+    return score_profile(profile.savings, profile.debt, profile.income)
+
+@st.cache_data(max_entries=8)
+def score_cohort_csv(csv_bytes):
+    """Score an uploaded CSV of student profiles, returning (scored frame, score distribution)"""
+    import pandas as pd
+    from scoring import score_distribution, score_profiles
     
-    # Deduct for debt
-    debt_map = {"None": 0, "Less than $1000": -5, "$1000-5000": -10, "$5001-25000": -15, "$25000+": -20}
-    score += debt_map.get(st.session_state.user_debt, 0)
+    scored = score_profiles(pd.read_csv(io.BytesIO(csv_bytes), dtype=str))
+    return scored, score_distribution(scored["Score"])
+
+@st.cache_resource
+def get_term_store():
+    """Load the financial term catalog once per process"""
+    return TermStore.from_file(TERMS_DATA_PATH)
+
+@st.cache_resource
+def get_search_index():
+    """Load the persisted term search index, rebuilding it only when the catalog has changed"""
+    from term_search import SearchIndex, catalog_digest
     
-    # Add for income
-    income_map = {"$0-500": 5, "$501-1000": 10, "$1001-2000": 15, "$2001-3000": 20, "$3000+": 25}
-    score += income_map.get(st.session_state.user_income, 0)
+    digest = catalog_digest(TERMS_DATA_PATH)
+    index = SearchIndex.load(SEARCH_CONFIG["index_path"], digest)
+    if index is None:
+        index = SearchIndex.build(get_term_store().entries, digest)
+        index.save(SEARCH_CONFIG["index_path"])
+    return index
+
+@st.cache_resource
+def get_term_graph():
+    """Load the related-term graph, adding any catalog terms appended since it was built"""
+    from term_graph import sync_graph
     
-    # Ensure score is between 0-100
-    return max(0, min(100, score))
+    return sync_graph(get_term_store().entries, RELATED_TERMS_CONFIG["graph_path"],
+                      RELATED_TERMS_CONFIG["neighbors"], RELATED_TERMS_CONFIG["dimensions"])
+
+@timed("get_related_terms")
+def get_related_terms(term):
+    """Related terms for a term: its curated list first, then its nearest neighbours in the graph"""
+    limit = RELATED_TERMS_CONFIG["display"]
+    min_score = RELATED_TERMS_CONFIG["min_score"]
+    graph = get_term_graph()
+    entry = get_term_store().lookup(term)
+    if entry is not None:
+        candidates = [*entry.get("related", []), *graph.related(entry["term"], limit, min_score)]
+    else:
+        # Terms outside the catalog are embedded on the fly and matched against it
+        candidates = graph.nearest(term, limit, min_score)
+    
+    own_key = normalize_term(entry["term"] if entry is not None else term)
+    related = [name for name in dict.fromkeys(candidates) if normalize_term(name) != own_key]
+    return related[:limit]
+
+@timed("search_terms")
+def search_terms(query):
+    """Find the catalog term a search query names, and other terms it may mean
+    
+    Returns (term, suggestions). term is the catalog title the query names -
+    exactly, through an alias, with a misspelled word, or as the start of a
+    title or alias word - or None when it names no catalog term. suggestions
+    are other titles starting with the query, then full-text BM25 hits.
+    """
+    limit = SEARCH_CONFIG["max_suggestions"]
+    index = get_search_index()
+    
+    completions = index.complete(query, limit + 1)
+    entry = get_term_store().lookup(query)
+    if entry is not None:
+        term = entry["term"]
+    else:
+        term = index.match(query)
+        if term is None and completions and len(normalize_term(query)) >= SEARCH_CONFIG["min_prefix_length"]:
+            term = completions[0]
+    
+    suggestions = [*completions, *(title for title, _ in index.search(query, limit + 1))]
+    return term, [title for title in dict.fromkeys(suggestions) if title != term][:limit]
+
+@st.cache_resource
+def get_llm_client():
+    """Create the LLM client shared by every session"""
+    from llm import LLMClient
+    
+    return LLMClient(LLM_CONFIG)
+
+@st.cache_resource
+def get_llm_gateway():
+    """Create the gateway that coalesces, queues and limits every LLM request in the process"""
+    from llm_gateway import LLMGateway
+    
+    return LLMGateway(
+        get_llm_client(),
+        get_llm_cache(),
+        max_concurrent=LLM_CONFIG["max_parallel_requests"],
+        max_queued=LLM_CONFIG["max_queued_requests"],
+        queue_timeout=LLM_CONFIG["queue_timeout"],
+        batching=LLM_CONFIG["batching"],
+        batch_size=LLM_CONFIG["batch_size"],
+        batch_wait=LLM_CONFIG["batch_wait_ms"] / 1000
+    )
+
+@st.cache_resource
+def get_llm_cache():
+    """Open the generated-response cache shared by every session"""
+    return ResponseCache(
+        LLM_CONFIG["cache_path"],
+        memory_entries=LLM_CONFIG["cache_memory_entries"],
+        max_bytes=LLM_CONFIG["cache_max_bytes"]
+    )
+
+def llm_cache_key(term, kind):
+    """Get the response cache key for one kind of generated term content"""
+    from llm import PROMPT_VERSION
+    
+    return make_cache_key(normalize_term(term), LLM_CONFIG["model"], LLM_CONFIG["temperature"], PROMPT_VERSION, kind)
+
+def generate_term_text(term, kind):
+    """Get generated term text ("content" or "examples"), from the cache when possible"""
+    from llm import build_messages
+    
+    key = llm_cache_key(term, kind)
+    text = get_llm_cache().get(key)
+    if text is None:
+        text = get_llm_gateway().complete(key, build_messages(kind, term))
+    else:
+        get_prefetcher().record_use(key)
+    return text
+
+@st.cache_resource
+def get_llm_executor():
+    """Create the worker pool used to run generations alongside the page script"""
+    return ThreadPoolExecutor(max_workers=LLM_CONFIG["max_parallel_requests"], thread_name_prefix="llm")
+
+@st.cache_resource
+def get_prefetcher():
+    """Create the bounded pool that generates content for likely next terms in the background"""
+    from prefetch import Prefetcher
+    
+    return Prefetcher(PREFETCH_CONFIG["max_workers"], PREFETCH_CONFIG["max_pending"])
+
+def prefetch_related_terms(terms):
+    """Start generating content for the terms this session is likely to open next
+    
+    Replaces the session's earlier queued prefetches, refunding them to its
+    budget, and stops queueing once the budget is spent.
+    """
+    ctx = get_script_run_ctx()
+    if not (LLM_CONFIG["enabled"] and PREFETCH_CONFIG["enabled"]) or ctx is None:
+        return
+    from llm import build_messages
+    
+    prefetcher = get_prefetcher()
+    cache = get_llm_cache()
+    gateway = get_llm_gateway()
+    budget = st.session_state.get('prefetch_budget', PREFETCH_CONFIG["session_budget"])
+    budget += prefetcher.cancel(ctx.session_id)
+    
+    for term in terms:
+        if not is_generated_term(term):
+            continue
+        for kind in ("content", "examples"):
+            key = llm_cache_key(term, kind)
+            if budget <= 0 or key in cache:
+                continue
+            messages = build_messages(kind, term)
+            fetch = lambda key=key, messages=messages: gateway.complete(key, messages)
+            if prefetcher.submit(ctx.session_id, key, fetch):
+                budget -= 1
+    st.session_state.prefetch_budget = budget
+
+@st.cache_resource
+def get_llm_latency_log():
+    """Get the process-wide log of recent generation latencies"""
+    return deque(maxlen=1000)
+
+def summarize_llm_latency():
+    """Return one row per kind of generated text with median/p95 time-to-first-token and total latency in ms"""
+    by_kind = {}
+    for entry in list(get_llm_latency_log()):
+        by_kind.setdefault(entry["kind"], []).append(entry)
+    
+    rows = []
+    for kind, entries in sorted(by_kind.items()):
+        ttft = sorted(entry["ttft"] for entry in entries)
+        total = sorted(entry["total"] for entry in entries)
+        rows.append({
+            "Kind": kind,
+            "Generations": len(entries),
+            "Median TTFT (ms)": round(percentile(ttft, 0.5) * 1000, 1),
+            "p95 TTFT (ms)": round(percentile(ttft, 0.95) * 1000, 1),
+            "Median total (ms)": round(percentile(total, 0.5) * 1000, 1),
+            "p95 total (ms)": round(percentile(total, 0.95) * 1000, 1)
+        })
+    return rows
+
+def is_generated_term(term):
+    """Check whether a term's content comes from the LLM rather than the catalog"""
+    return LLM_CONFIG["enabled"] and get_term_store().lookup(term) is None
 
+def stream_term_text(term, kind):
+    """Get an iterator over generated term text that yields chunks as they arrive
+    
+    Cached responses are yielded whole. Fresh generations go through the
+    gateway, so sessions asking for the same text at once share one upstream
+    call, and record their time-to-first-token and total latency.
+    Resources are resolved here, so call this on the script thread even when
+    the iterator is consumed on a worker thread.
+    """
+    from llm import build_messages
+    
+    cache = get_llm_cache()
+    gateway = get_llm_gateway()
+    prefetcher = get_prefetcher()
+    latency_log = get_llm_latency_log()
+    key = llm_cache_key(term, kind)
+    
+    def chunks():
+        cached = cache.get(key)
+        if cached is not None:
+            prefetcher.record_use(key)
+            yield cached
+            return
+        
+        started = time.perf_counter()
+        first_token = None
+        parts = []
+        for chunk in gateway.stream(key, build_messages(kind, term)):
+            if first_token is None:
+                first_token = time.perf_counter()
+            parts.append(chunk)
+            yield chunk
+        finished = time.perf_counter()
+        
+        latency_log.append({
+            "term": normalize_term(term),
+            "kind": kind,
+            "ttft": (first_token or finished) - started,
+            "total": finished - started
+        })
+    
+    return chunks()
+
+@timed("get_financial_term_content")
 def get_financial_term_content(term):
     """Get content for a financial term"""
-    term = term.lower()
-    
-    # Dictionary of financial terms and their explanations
-    terms = {
-        "budgeting": {
-            "content": """
-            Budgeting is simply a plan for how you'll spend your money each month. Think of it like a food plan for your wallet!
-            
-            It helps you make sure you have enough money for the things you need (like rent and food) before spending on things you want (like entertainment).
-            """,
-            "examples": """
-            **Student Example**: Maria receives $1,200 monthly from her part-time job and financial aid. Her simple budget is:
-            - Rent & Utilities: $600 (50%)
-            - Groceries: $240 (20%)
-            - Transportation: $120 (10%)
-            - School Supplies: $120 (10%)
-            - Fun Money: $120 (10%)
-            
-            By tracking these categories using a simple app, Maria knows exactly when she can afford to go out with friends.
-            """,
-            "related": ["Emergency Fund", "50/30/20 Rule", "Expense Tracking"]
-        },
-        "student loans": {
-            "content": """
-            Student loans are money borrowed to pay for college or university. Unlike scholarships or grants, loans must be paid back, usually with interest.
-            
-            Federal student loans come from the government and typically have more flexible repayment options than private loans from banks or other lenders.
-            """,
-            "examples": """
-            **Student Example**: Alex borrowed $20,000 in federal student loans at 4.5% interest. 
-            
-            After graduation, Alex's monthly payment is about $207 on a standard 10-year repayment plan. The total paid over 10 years will be approximately $24,840 - meaning $4,840 goes to interest.
-            
-            By making an extra $50 payment each month, Alex could pay off the loan 2 years earlier and save about $1,200 in interest.
-            """,
-            "related": ["Loan Subsidization", "Repayment Plans", "Loan Forgiveness"]
-        },
-        "credit scores": {
-            "content": """
-            A credit score is like a financial report card that shows how reliable you are with borrowing and repaying money. 
-            
-            Scores typically range from 300-850, with higher scores showing better credit management. Your score affects whether you can get loans, credit cards, apartments, and even some jobs.
-            """,
-            "examples": """
-            **Student Example**: Jordan got their first credit card in college with a $500 limit. By making small purchases and paying the balance in full each month, Jordan built a credit score of 720 within two years.
-            
-            When Jordan graduated and wanted to rent an apartment, the landlord checked their credit score. Having a good score meant Jordan didn't need a co-signer and got approved easily.
-            """,
-            "related": ["Credit Reports", "Credit Utilization", "Payment History"]
-        },
-        "investing basics": {
-            "content": """
-            Investing means putting money into something with the hope it will grow over time. It's different from saving because it involves some risk, but generally offers higher potential returns.
-            
-            Common beginner investments include stocks (ownership in companies), bonds (loans to companies or governments), and funds (collections of stocks/bonds).
-            """,
-            "examples": """
-            **Student Example**: Chris started investing with just $25 a month in a low-cost index fund through a free investing app while in sophomore year.
-            
-            By graduation 2.5 years later, Chris had invested about $750 total, but the account had grown to $840 (a 12% return). Chris learned that starting early, even with small amounts, takes advantage of compound growth.
-            """,
-            "related": ["Index Funds", "Compound Growth", "Risk Tolerance"]
-        }
+    entry = get_term_store().lookup(term)
+    
+    # Return term content if it exists, otherwise generate it or return generic content
+    if entry is not None:
+        return entry
+    
+    if LLM_CONFIG["enabled"]:
+        import requests
+        
+        try:
+            return {
+                "content": generate_term_text(term, "content"),
+                "examples": generate_term_text(term, "examples"),
+                "related": get_related_terms(term)
+            }
+        except requests.RequestException:
+            pass
+    
+    return {
+        "content": f"This would contain a simple, student-friendly explanation of {term.lower()}.",
+        "examples": "This section would show real-world examples of how this concept applies to student life.",
+        "related": get_related_terms(term)
     }
+
+@st.cache_resource
+def get_history_store():
+    """Open the on-disk price history store shared by every session"""
+    from price_history import PriceHistoryStore
     
-    # Return term content if it exists, otherwise return generic content
-    if term in terms:
-        return terms[term]
-    else:
-        return {
-            "content": f"This would contain a simple, student-friendly explanation of {term}.",
-            "examples": "This section would show real-world examples of how this concept applies to student life.",
-            "related": ["Term 1", "Term 2", "Term 3"]
-        }
-
-def generate_market_data():
-    """Generate sample market data for demonstration"""
-    import datetime
-    
-    today = datetime.date.today()
-    dates = [today - datetime.timedelta(days=x) for x in range(30, 0, -1)]
-    
-    # Create sample performance data
-    np.random.seed(42)  # For reproducible results
-    
-    spy_start = 460
-    qqq_start = 440
-    vti_start = 230
-    
-    spy_data = [spy_start]
-    qqq_data = [qqq_start]
-    vti_data = [vti_start]
-    
-    for i in range(1, 30):
-        spy_data.append(spy_data[-1] * (1 + np.random.normal(0.0003, 0.008)))
-        qqq_data.append(qqq_data[-1] * (1 + np.random.normal(0.0004, 0.01)))
-        vti_data.append(vti_data[-1] * (1 + np.random.normal(0.0003, 0.007)))
-    
-    # Create DataFrame
-    market_data = pd.DataFrame({
-        'Date': dates,
-        'S&P 500 (SPY)': spy_data,
-        'NASDAQ (QQQ)': qqq_data,
-        'Total Market (VTI)': vti_data
+    return PriceHistoryStore(HISTORY_CONFIG["path"])
+
+def _sync_market_history(store, provider, metrics):
+    """Append any missing bars through yesterday and roll the index metrics forward over them
+    
+    A ticker with no stored history is backfilled to end at its latest quote
+    (or its configured start price if there is none), so the charts and
+    index cards agree with the quote table.
+    Returns the last synced date and each ticker's metrics, keyed by symbol.
+    """
+    from price_history import sync_simulated_history
+    
+    end_date = datetime.date.today() - datetime.timedelta(days=1)
+    symbols = [ticker["symbol"] for ticker in MARKET_TICKERS.values()]
+    unsynced = [symbol for symbol in symbols if store.last_bar(symbol) is None]
+    quotes = provider.get_quotes(unsynced) if unsynced else {}
+    for ticker in MARKET_TICKERS.values():
+        quote = quotes.get(ticker["symbol"])
+        latest_price = quote["price"] if quote and quote["price"] else ticker["start"]
+        sync_simulated_history(
+            store, ticker["symbol"], latest_price, ticker["drift"], ticker["volatility"],
+            end_date, HISTORY_CONFIG["backfill_days"]
+        )
+    return {"end_date": end_date, "metrics": metrics.sync(store, symbols)}
+
+@timed("get_price_history")
+def get_price_history(days):
+    """Get the last `days` days of stored market history, one column per ticker"""
+    import pandas as pd
+    
+    history = get_market_snapshot("price_history").value("price_history")
+    end_date = history["end_date"] if history else datetime.date.today() - datetime.timedelta(days=1)
+    store = get_history_store()
+    start = end_date - datetime.timedelta(days=days - 1)
+    closes = {}
+    for name, ticker in MARKET_TICKERS.items():
+        bars = store.read(ticker["symbol"], start, end_date)
+        closes[name] = pd.Series(bars["close"], index=bars["date"])
+    
+    market_data = pd.DataFrame(closes)
+    market_data.index.name = 'Date'
+    return market_data.reset_index()
+
+@st.cache_resource
+def get_market_provider():
+    """Create the market data provider shared by every session"""
+    from market_providers import create_provider
+    
+    return create_provider(API_CONFIG, QUOTES_FIXTURE_PATH)
+
+def _fetch_quote_table(provider):
+    """Fetch the latest quotes for every ticker as a display-ready DataFrame"""
+    import pandas as pd
+    
+    quotes = provider.get_quotes([ticker["symbol"] for ticker in MARKET_TICKERS.values()])
+    return pd.DataFrame({
+        'Symbol': [quote['symbol'] for quote in quotes.values()],
+        'Price': [quote['price'] for quote in quotes.values()],
+        'Change (%)': [quote['change_percent'] for quote in quotes.values()],
+        'As Of': pd.to_datetime([quote['timestamp'] for quote in quotes.values()], unit='s')
     })
+
+def _load_bank_index():
+    """Load and index the bank product catalog"""
+    from bank_index import BankRateIndex
     
-    return market_data
+    return BankRateIndex.from_file(BANK_CATALOG_CONFIG["catalog_path"] or BANK_DATA_PATH)
 
-def get_bank_data():
-    """Get sample bank interest rate data"""
-    bank_data = {
-        'Bank': ['Student Credit Union', 'Bank A', 'Bank B', 'Online Bank', 'Credit Union'],
-        'Savings Rate': [2.0, 1.5, 1.8, 2.5, 2.2],
-        'CD Rate (1-year)': [3.5, 3.0, 3.2, 3.8, 3.6],
-        'Student Account Perks': ['Yes', 'No', 'Yes', 'No', 'Yes']
-    }
+def _load_loan_rates():
+    """Load the student loan interest rate table"""
+    import pandas as pd
+    
+    with open(LOAN_DATA_PATH, encoding="utf-8") as f:
+        return pd.DataFrame(json.load(f))
+
+@st.cache_resource
+def get_market_refresher():
+    """Start the background thread that refreshes market data for every session
     
-    return pd.DataFrame(bank_data)
+    Quotes, bank rates, loan rates and price history each refresh on their
+    own interval no matter how many sessions are reading, and sessions read
+    whatever the latest snapshot holds instead of fetching anything.
+    """
+    from market_metrics import MarketMetrics
+    from market_refresher import MarketRefresher
+    
+    # Resolve shared resources here, on the script thread, for the fetches to use
+    provider = get_market_provider()
+    history_store = get_history_store()
+    # Only the refresher thread updates the metrics, so they need no lock
+    metrics = MarketMetrics(HISTORY_CONFIG["volatility_window"], HISTORY_CONFIG["periods_per_year"])
+    
+    intervals = MARKET_REFRESH_CONFIG["intervals"]
+    refresher = MarketRefresher(MARKET_REFRESH_CONFIG["retry_seconds"], MARKET_REFRESH_CONFIG["max_backoff_seconds"])
+    refresher.add_source("quotes", lambda: _fetch_quote_table(provider), intervals["quotes"])
+    refresher.add_source("bank_rates", _load_bank_index, intervals["bank_rates"])
+    refresher.add_source("loan_rates", _load_loan_rates, intervals["loan_rates"])
+    refresher.add_source("price_history", lambda: _sync_market_history(history_store, provider, metrics),
+                         intervals["price_history"])
+    refresher.start()
+    return refresher
+
+def get_market_snapshot(*names):
+    """Get the latest market snapshot, waiting only for named sources that have never loaded"""
+    return get_market_refresher().wait_for(names, MARKET_REFRESH_CONFIG["first_load_timeout"])
+
+def get_quote_table():
+    """Get the latest quotes for every ticker as a display-ready DataFrame (empty if unavailable)"""
+    import pandas as pd
+    
+    return get_market_snapshot("quotes").value("quotes", pd.DataFrame())
+
+def get_index_metrics():
+    """Get each ticker's precomputed returns, volatility, drawdown and 52-week range, keyed by symbol"""
+    history = get_market_snapshot("price_history").value("price_history")
+    return history["metrics"] if history else {}
+
+def get_bank_index():
+    """Get the indexed bank product catalog shared by every session"""
+    return get_market_snapshot("bank_rates").value("bank_rates")
 
 def get_loan_data():
-    """Get sample student loan interest rate data"""
-    loan_data = {
-        'Loan Type': ['Federal Undergraduate', 'Federal Graduate', 'Private (Good Credit)', 'Private (Average Credit)'],
-        'Interest Rate': [5.5, 6.6, 7.2, 10.8]
-    }
+    """Get the student loan interest rate table shared by every session"""
+    return get_market_snapshot("loan_rates").value("loan_rates")
+
+def describe_market_freshness(name):
+    """Describe how old a market data source is, for a caption under its section"""
+    snapshot = get_market_refresher().snapshot()
+    age = snapshot.age(name)
+    if age is None:
+        return "Not loaded yet."
     
-    return pd.DataFrame(loan_data)
-
-def get_savings_allocation(user_debt, user_income):
-    """Get recommended savings allocation based on user profile"""
-    if user_debt in ["$5001-25000", "$25000+"]:
-        return {
-            'Category': ['Essentials', 'Debt Repayment', 'Emergency Fund', 'Flexible'],
-            'Percentage': [50, 20, 20, 10]
-        }
-    elif user_income in ["$0-500", "$501-1000"]:
-        return {
-            'Category': ['Essentials', 'Emergency Fund', 'Education & Flexible'],
-            'Percentage': [60, 20, 20]
-        }
+    if age < 60:
+        text = "Updated just now"
+    elif age < 3600:
+        text = f"Updated {age // 60:.0f} min ago"
+    elif age < 86400:
+        text = f"Updated {age // 3600:.0f} h ago"
     else:
-        return {
-            'Category': ['Essentials', 'Financial Goals', 'Flexible'],
-            'Percentage': [50, 30, 20]
-        }
\ No newline at end of file
+        text = f"Updated {age // 86400:.0f} days ago"
+    if snapshot.entry(name).error:
+        text += " (refresh failing, showing the last good data)"
+    return text + "."
+
+@st.cache_resource
+def get_news_store():
+    """Get the ranked news store, starting its background ingestion thread on first use"""
+    from news import NewsIngestor, NewsStore
+    
+    store = NewsStore()
+    NewsIngestor(
+        store,
+        feeds=NEWS_CONFIG["feeds"],
+        feed_dir=NEWS_CONFIG["feed_dir"],
+        state_path=NEWS_CONFIG["state_path"],
+        interval=NEWS_CONFIG["poll_interval_seconds"],
+        store_size=NEWS_CONFIG["store_size"],
+        index_size=NEWS_CONFIG["index_size"],
+        duplicate_threshold=NEWS_CONFIG["duplicate_threshold"]
+    ).start()
+    return store
+
+def get_loan_scenarios(principal):
+    """Amortize every loan type x term x extra payment scenario for a principal, one row per scenario"""
+    return _amortize_loan_scenarios(principal, get_loan_data())
+
+@st.cache_data(max_entries=64)
+def _amortize_loan_scenarios(principal, loan_df):
+    """Build the scenario table for one principal and loan rate table (re-keyed when the rates refresh)"""
+    import numpy as np
+    import pandas as pd
+    from amortization import amortize_grid
+    
+    terms = LOAN_SCENARIOS["terms_years"]
+    extras = LOAN_SCENARIOS["extra_payments"]
+    grid = amortize_grid(principal, loan_df['Interest Rate'], terms, extras)
+    
+    # Interest saved is measured against paying no extra on the same loan and term
+    saved = grid["total_interest"][:, :, :1] - grid["total_interest"]
+    loan_index, term_index, extra_index = np.indices(grid["total_interest"].shape).reshape(3, -1)
+    return pd.DataFrame({
+        'Loan Type': loan_df['Loan Type'].to_numpy()[loan_index],
+        'Term (years)': np.asarray(terms)[term_index],
+        'Extra Payment': np.asarray(extras)[extra_index],
+        'Monthly Payment': grid["payment"].ravel() + np.asarray(extras)[extra_index],
+        'Payoff Month': grid["payoff_month"].ravel(),
+        'Total Interest': grid["total_interest"].ravel(),
+        'Interest Saved': saved.ravel()
+    })
+
+def get_loan_balance_schedules(principal, term, extra):
+    """Remaining balance month by month for every loan type at one term and extra payment"""
+    return _loan_balance_schedules(principal, term, extra, get_loan_data())
+
+@st.cache_data(max_entries=64)
+def _loan_balance_schedules(principal, term, extra, loan_df):
+    """Build one row per (loan type, month) for a principal, term, extra payment and loan rate table"""
+    import numpy as np
+    import pandas as pd
+    from amortization import balance_schedules, monthly_payment
+    
+    months = term * 12
+    payments = monthly_payment(principal, loan_df['Interest Rate'], months) + extra
+    balances = balance_schedules(principal, loan_df['Interest Rate'], payments, months)
+    return pd.DataFrame({
+        'Loan Type': np.repeat(loan_df['Loan Type'].to_numpy(), months + 1),
+        'Month': np.tile(np.arange(months + 1), len(loan_df)),
+        'Balance': balances.ravel()
+    })
+
+@st.cache_data(max_entries=64)
+def get_savings_projection(savings, income):
+    """Project yearly balances for every INVESTMENT_OPTIONS entry from savings and income bracket codes
+    
+    Starts from the savings bracket's representative amount and adds
+    contribution_rate of the income bracket's amount each month. Returns one
+    row per (option, year) with 10th-90th percentile balance columns.
+    """
+    import pandas as pd
+    from projections import PERCENTILES, project_balances
+    
+    years = PROJECTION_CONFIG["years"]
+    
+    with span("projection.simulate"):
+        bands = project_balances(
+            BRACKET_AMOUNTS["savings"][savings],
+            BRACKET_AMOUNTS["income"][income] * PROJECTION_CONFIG["contribution_rate"],
+            [option["annual_return"] for option in INVESTMENT_OPTIONS.values()],
+            [option["volatility"] for option in INVESTMENT_OPTIONS.values()],
+            years,
+            PROJECTION_CONFIG["paths"],
+            seed=PROJECTION_CONFIG["seed"],
+            batch_paths=PROJECTION_CONFIG["batch_paths"]
+        )
+    
+    frames = []
+    for name, option_bands in zip(INVESTMENT_OPTIONS, bands):
+        frame = pd.DataFrame(option_bands.T, columns=[f"P{p}" for p in PERCENTILES])
+        frame.insert(0, 'Year', range(years + 1))
+        frame.insert(0, 'Option', name)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+@timed("get_savings_allocation")
+def get_savings_allocation(profile):
+    """Get the recommended savings allocation bucket name and data for a StudentProfile"""
+    from scoring import ALLOCATIONS, allocation_bucket
+    
+    bucket = allocation_bucket(profile.debt, profile.income)
+    return bucket, ALLOCATIONS[bucket]